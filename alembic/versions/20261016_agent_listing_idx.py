@@ -0,0 +1,33 @@
+"""partial (tenant_id, created_at) index for the agent listing
+
+Revision ID: 20261016_agent_listing_idx
+Revises: 20261016_reset_token_unused_idx
+Create Date: 2026-10-16 16:00:00.000000
+
+The workspace agent list filters on tenant_id and is_deleted = false and orders
+by created_at DESC with a LIMIT. With this index Postgres walks the newest rows
+of one workspace instead of fetching every agent in it and sorting.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20261016_agent_listing_idx"
+down_revision: Union[str, Sequence[str], None] = "20261016_reset_token_unused_idx"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_agent_active_tenant_id_created_at",
+        "agent",
+        ["tenant_id", "created_at"],
+        postgresql_where=sa.text("is_deleted = false"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_agent_active_tenant_id_created_at", table_name="agent")
@@ -0,0 +1,35 @@
+"""partial index for pending invites by (email, tenant_id)
+
+Revision ID: 20261016_invite_pending_idx
+Revises: 20261016_tenant_schema_uq
+Create Date: 2026-10-16 13:00:00.000000
+
+invite_team_member and accept_invite only ever look up pending invites;
+indexing just those rows keeps the index small as accepted/expired history
+grows. user_tenant_association(user_id, tenant_id) is already covered by
+uq_user_tenant_association_user_tenant (9f3a2c7e5d41) and invite.token by
+its unique index.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20261016_invite_pending_idx"
+down_revision: Union[str, Sequence[str], None] = "20261016_tenant_schema_uq"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_invite_pending_email_tenant_id",
+        "invite",
+        ["email", "tenant_id"],
+        postgresql_where=sa.text("status IN ('pending', 'PENDING')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_invite_pending_email_tenant_id", table_name="invite")
@@ -0,0 +1,39 @@
+"""store refresh tokens as SHA-256 digests
+
+Revision ID: 20261016_refresh_token_sha256
+Revises: 20261016_invite_pending_idx
+Create Date: 2026-10-16 14:00:00.000000
+
+refreshtoken.token (and replaced_by_token) now hold the hex SHA-256 digest
+of the value handed to the client (app.core.security.hash_refresh_token), so
+a database leak no longer yields usable sessions. Existing rows are hashed in
+place so sessions issued before the deploy keep refreshing; the digest fits
+the existing String(255) column and its unique index.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20261016_refresh_token_sha256"
+down_revision: Union[str, Sequence[str], None] = "20261016_invite_pending_idx"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        sa.text(
+            """
+            UPDATE refreshtoken
+            SET token = encode(sha256(convert_to(token, 'UTF8')), 'hex'),
+                replaced_by_token = encode(sha256(convert_to(replaced_by_token, 'UTF8')), 'hex')
+            """
+        )
+    )
+
+
+def downgrade() -> None:
+    # Digests cannot be turned back into client tokens; end every session.
+    op.execute(sa.text("UPDATE refreshtoken SET revoked = true WHERE NOT revoked"))
@@ -0,0 +1,37 @@
+"""store password-reset tokens as SHA-256 digests
+
+Revision ID: 20261016_reset_token_sha256
+Revises: 20261016_agent_listing_idx
+Create Date: 2026-10-16 17:00:00.000000
+
+passwordresettoken.token now holds the hex SHA-256 digest of the emailed value
+(app.core.security.hash_password_reset_token), matching refresh tokens. Rows
+are hashed in place so links already sitting in inboxes keep working; the
+digest fits the existing String(255) column and its unique index.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20261016_reset_token_sha256"
+down_revision: Union[str, Sequence[str], None] = "20261016_agent_listing_idx"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        sa.text(
+            """
+            UPDATE passwordresettoken
+            SET token = encode(sha256(convert_to(token, 'UTF8')), 'hex')
+            """
+        )
+    )
+
+
+def downgrade() -> None:
+    # Digests cannot be turned back into emailed tokens; retire them all.
+    op.execute(sa.text("UPDATE passwordresettoken SET used = true WHERE NOT used"))
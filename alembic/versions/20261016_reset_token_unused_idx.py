@@ -0,0 +1,33 @@
+"""partial index for unused password-reset tokens by user_id
+
+Revision ID: 20261016_reset_token_unused_idx
+Revises: 20261016_refresh_token_sha256
+Create Date: 2026-10-16 15:00:00.000000
+
+forgot_password invalidates a user's outstanding reset tokens with a single
+UPDATE ... WHERE user_id = :id AND used = false. Indexing just the unused rows
+lets that statement go straight to its targets while used tokens accumulate.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20261016_reset_token_unused_idx"
+down_revision: Union[str, Sequence[str], None] = "20261016_refresh_token_sha256"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_passwordresettoken_unused_user_id",
+        "passwordresettoken",
+        ["user_id"],
+        postgresql_where=sa.text("used = false"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_passwordresettoken_unused_user_id", table_name="passwordresettoken")
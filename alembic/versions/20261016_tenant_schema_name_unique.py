@@ -0,0 +1,50 @@
+"""unique tenant.schema_name
+
+Revision ID: 20261016_tenant_schema_uq
+Revises: c35f4e3d5e3f
+Create Date: 2026-10-16 12:00:00.000000
+
+create_tenant now inserts with ON CONFLICT (schema_name) DO NOTHING, which
+needs a unique index on schema_name to act as the conflict arbiter.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20261016_tenant_schema_uq"
+down_revision: Union[str, Sequence[str], None] = "c35f4e3d5e3f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Suffix duplicate schema names left by the old check-then-insert race
+    # (keep oldest row per schema_name) so the unique index can be applied.
+    op.execute(
+        sa.text(
+            """
+            WITH ranked AS (
+                SELECT
+                    id,
+                    ROW_NUMBER() OVER (
+                        PARTITION BY schema_name
+                        ORDER BY created_at ASC NULLS LAST, id ASC
+                    ) AS rn
+                FROM tenant
+            )
+            UPDATE tenant AS t
+            SET schema_name = t.schema_name || '_' || LEFT(t.id::text, 6)
+            FROM ranked
+            WHERE t.id = ranked.id
+              AND ranked.rn > 1
+            """
+        )
+    )
+
+    op.create_unique_constraint("tenant_schema_name_key", "tenant", ["schema_name"])
+
+
+def downgrade() -> None:
+    op.drop_constraint("tenant_schema_name_key", "tenant", type_="unique")
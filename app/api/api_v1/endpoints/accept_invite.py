@@ -1,16 +1,20 @@
+import uuid
+
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import insert, update
 from sqlalchemy.orm import Session
-from app.api.deps import get_db
+from app.api.deps import get_db, get_request_now
 from app.models.invite import Invite
 from app.models.user import User, user_tenant_association
 from app.models.role import Role
 from app.schemas.user import AcceptInviteOut
 from app.schemas.base import SuccessResponse
-from app.core.security import get_password_hash, create_user_token, create_refresh_token_value, refresh_token_expires_at
+from app.core.security import get_password_hash, create_user_token, create_refresh_token_value, hash_refresh_token, refresh_token_expires_at
 from app.models.refresh_token import RefreshToken
 from app.utils.response import create_success_response
-from app.services.role_service import get_default_product_id
-from datetime import datetime, timezone
+from app.services.role_service import READ_ONLY, get_default_product_id, get_role_id_by_name
+from app.services import user_cache_service
+from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
@@ -21,7 +25,8 @@ router = APIRouter()
 def accept_invite(
     token: str,
     password: str,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    now: datetime = Depends(get_request_now),
 ):
     """
     Accept an invitation to join a tenant.
@@ -33,142 +38,167 @@ def accept_invite(
     Returns:
         User details and access token
     """
-    # Find the invitation by token
-    invite = db.query(Invite).filter(
-        Invite.token == token,
-        Invite.status.in_(["pending", "PENDING"]),
-    ).first()
+    pending = Invite.status.in_(["pending", "PENDING"])
+    
+    # Claim the invitation in one statement: only a pending, unexpired row
+    # flips to accepted, so two concurrent requests cannot both consume it.
+    # Nothing is committed until the membership is written below. The
+    # RETURNING row is plain values, so nothing expires on that commit.
+    claimed = db.execute(
+        update(Invite)
+        .where(Invite.token == token, pending, Invite.expires_at > now)
+        .values(status="accepted", accepted_at=now)
+        .returning(Invite.email, Invite.tenant_id, Invite.role_id)
+    ).one_or_none()
     
-    if not invite:
+    if not claimed:
+        # Distinguish an expired invitation (mark it so) from an unknown token
+        expired_id = db.execute(
+            update(Invite)
+            .where(Invite.token == token, pending, Invite.expires_at <= now)
+            .values(status="expired")
+            .returning(Invite.id)
+        ).scalar_one_or_none()
+        if expired_id:
+            db.commit()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invitation has expired"
+            )
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Invalid or expired invitation token"
         )
-    
-    # Check if invitation is expired (make timezone-aware for reliable comparison)
-    exp = invite.expires_at
-    if exp.tzinfo is None:
-        exp = exp.replace(tzinfo=timezone.utc)
-    if exp < datetime.now(timezone.utc):
-        # Mark invitation as expired
-        invite.status = "expired"
-        db.commit()
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invitation has expired"
-        )
+    email, tenant_id, target_role_id = claimed
     
     # Check if user already exists with this email
-    existing_user = db.query(User).filter(User.email == invite.email).first()
+    existing_user = db.query(User).filter(User.email == email).first()
     password_reset = False  # Track if password was reset for existing user
     
     if existing_user:
         # User already exists, add them to the new tenant and update password if provided
-        user = existing_user
+        user_id = existing_user.id
+        user_values = {"current_tenant_id": tenant_id}
         
         # Update password if provided (reset password for existing user)
         if password:
-            hashed_password = get_password_hash(password)
-            user.hashed_password = hashed_password
+            user_values["hashed_password"] = get_password_hash(password)
             password_reset = True
-            logger.info(f"Password reset for existing user {user.email} via invitation acceptance")
+            logger.info(f"Password reset for existing user {existing_user.email} via invitation acceptance")
         
-        # Check if user is already in this tenant
-        from sqlalchemy import text
-        result = db.execute(text("""
-            SELECT COUNT(*) FROM user_tenant_association 
-            WHERE user_id = :user_id AND tenant_id = :tenant_id
-        """), {"user_id": str(user.id), "tenant_id": str(invite.tenant_id)})
+        # Check if user is already in this tenant (first-match probe, no COUNT)
+        already_member = (
+            db.query(user_tenant_association.c.user_id)
+            .filter(
+                user_tenant_association.c.user_id == user_id,
+                user_tenant_association.c.tenant_id == tenant_id,
+            )
+            .first()
+        )
         
-        if result.scalar() > 0:
+        if already_member:
+            db.rollback()  # release the invite claim
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="User is already a member of this tenant."
             )
-    else:
-        # Create new user - use email prefix as name for now
-        hashed_password = get_password_hash(password)
-        email_prefix = invite.email.split('@')[0]
-        user = User(
-            first_name=email_prefix,
-            last_name="User",
-            email=invite.email,
-            hashed_password=hashed_password,
-            current_tenant_id=invite.tenant_id
-        )
         
-        db.add(user)
-        db.commit()
-        db.refresh(user)
+        first_name = existing_user.first_name
+        last_name = existing_user.last_name
+        phone = existing_user.phone
+        join_date = existing_user.join_date
+        created_at = existing_user.created_at
+    else:
+        # New user - use email prefix as name for now. id and timestamps are
+        # set here so the response needs no read-back after the insert.
+        user_id = uuid.uuid4()
+        first_name = email.split('@')[0]
+        last_name = "User"
+        phone = None
+        join_date = created_at = now
     
     # Determine the role to assign to the user (either invited role_id or default read_only)
-    target_role_id = invite.role_id
     if not target_role_id:
-        from app.services.role_service import READ_ONLY
-        role_obj = db.query(Role).filter(Role.name == READ_ONLY).first()
-        if not role_obj:
+        target_role_id = get_role_id_by_name(db, READ_ONLY)
+        if not target_role_id:
+            db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Default read_only role not found. Please contact administrator."
             )
-        target_role_id = role_obj.id
+        target_role_name = READ_ONLY
     else:
         role_obj = db.query(Role).filter(Role.id == target_role_id).first()
         if not role_obj:
+            db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Selected invitation role not found. Please contact administrator."
             )
-
-    # Insert into user_tenant_association table
+        target_role_name = role_obj.name
     default_product_id = get_default_product_id(db)
+    
+    rt_value = create_refresh_token_value()
+    
+    # All writes are plain Core statements sent back-to-back in one
+    # transaction: no unit-of-work flush ordering, and no post-commit
+    # reload of the user row to build the response.
+    if existing_user:
+        db.execute(update(User).where(User.id == user_id).values(**user_values))
+    else:
+        db.execute(
+            insert(User).values(
+                id=user_id,
+                first_name=first_name,
+                last_name=last_name,
+                email=email,
+                hashed_password=get_password_hash(password),
+                join_date=join_date,
+                created_at=created_at,
+                current_tenant_id=tenant_id,
+            )
+        )
     db.execute(
         user_tenant_association.insert().values(
-            user_id=user.id,
-            tenant_id=invite.tenant_id,
+            user_id=user_id,
+            tenant_id=tenant_id,
             role_id=target_role_id,
             product_id=default_product_id
         )
     )
-    
-    # Update user's current_tenant_id to the invited tenant
-    user.current_tenant_id = invite.tenant_id
-    
-    # Update invitation status
-    invite.status = "accepted"
-    invite.accepted_at = datetime.now(timezone.utc)
-    
+    db.execute(
+        insert(RefreshToken).values(
+            user_id=user_id,
+            token=hash_refresh_token(rt_value),
+            expires_at=refresh_token_expires_at(),
+            revoked=False
+        )
+    )
+    # Single commit: user, membership, invite status and refresh token land
+    # atomically — no window where a user exists without tenant membership.
     db.commit()
+    if existing_user:
+        # Core UPDATE bypasses the ORM events that evict the cached auth user
+        user_cache_service.invalidate(user_id)
     
     # Create access token
     access_token = create_user_token(
-        user_id=user.id,
-        email=user.email,
-        tenant_id=invite.tenant_id,
-        role=role_obj.name
+        user_id=user_id,
+        email=email,
+        tenant_id=tenant_id,
+        role=target_role_name
     )
-
-    # Create refresh token
-    rt_value = create_refresh_token_value()
-    rt = RefreshToken(
-        user_id=user.id,
-        token=rt_value,
-        expires_at=refresh_token_expires_at(),
-        revoked=False
-    )
-    db.add(rt)
-    db.commit()
     
     # Return user details plus the session tokens
     user_out = AcceptInviteOut(
-        id=user.id,
-        first_name=user.first_name,
-        last_name=user.last_name,
-        email=user.email,
-        phone=user.phone,
-        join_date=user.join_date,
-        created_at=user.created_at,
-        current_tenant_id=user.current_tenant_id,
+        id=user_id,
+        first_name=first_name,
+        last_name=last_name,
+        email=email,
+        phone=phone,
+        join_date=join_date,
+        created_at=created_at,
+        current_tenant_id=tenant_id,
         access_token=access_token,
         refresh_token=rt_value
     )
@@ -90,8 +90,10 @@ def create_plan(
 ):
     """Create a new plan (admin or owner only)"""
     # Check if plan with same name already exists
-    existing_plan = db.query(Plan).filter(Plan.name == plan_data.name).first()
-    if existing_plan:
+    name_taken = db.query(
+        db.query(Plan.id).filter(Plan.name == plan_data.name).exists()
+    ).scalar()
+    if name_taken:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Plan with this name already exists"
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from typing import List
 from app.schemas.role import RoleCreate, RoleOut
@@ -6,6 +7,7 @@ from app.schemas.base import SuccessResponse
 from app.models.role import Role
 from app.models.user import User
 from app.api.deps import get_db, require_admin, require_admin_or_api_key
+from app.services import role_cache_service
 from app.services.audit_service import log_audit_event
 from app.utils.response import create_success_response
 import uuid
@@ -16,37 +18,41 @@ router = APIRouter()
 @router.post("/", response_model=SuccessResponse[RoleOut],include_in_schema=False)
 def create_role(request: Request, role_in: RoleCreate, user: User = Depends(require_admin), db: Session = Depends(get_db)):
     """Create a new role"""
-    existing_role = db.query(Role).filter(Role.name == role_in.name).first()
-    if existing_role:
-        raise HTTPException(status_code=400, detail="Role name already exists")
-
     db_role = Role(**role_in.model_dump())
     db.add(db_role)
-    db.commit()
-    db.refresh(db_role)
+    try:
+        # The INSERT returns server defaults (created_at), so the response is
+        # built before commit expires the instance — no refresh SELECT.
+        db.flush()
+        role_out = RoleOut.model_validate(db_role)
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Role name already exists")
+    role_cache_service.invalidate()
     log_audit_event(
         db,
         request=request,
         tenant_id=user.current_tenant_id,
         action="rbac_role.created",
         resource_type="rbac_role",
-        resource_id=db_role.id,
+        resource_id=role_out.id,
         new_value=role_in.model_dump(),
         actor_user_id=user.id,
     )
-    return create_success_response(db_role, "Role created successfully", status.HTTP_201_CREATED)
+    return create_success_response(role_out, "Role created successfully", status.HTTP_201_CREATED)
 
 @router.get("/", response_model=SuccessResponse[List[RoleOut]])
 def get_roles(skip: int = 0, limit: int = 100, user: User = Depends(require_admin_or_api_key), db: Session = Depends(get_db)):
     """Get all roles"""
-    roles = db.query(Role).offset(skip).limit(limit).all()
+    roles = role_cache_service.list_roles(db, skip, limit)
     return create_success_response(roles, "Roles retrieved successfully")
 
 
 @router.get("/{role_id}", response_model=SuccessResponse[RoleOut],include_in_schema=False)
 def get_role(role_id: uuid.UUID, user: User = Depends(require_admin), db: Session = Depends(get_db)):
     """Get a specific role by ID"""
-    role = db.query(Role).filter(Role.id == role_id).first()
+    role = role_cache_service.get_role(db, role_id)
     if not role:
         raise HTTPException(status_code=404, detail="Role not found")
     return create_success_response(role, "Role retrieved successfully")
@@ -59,16 +65,20 @@ def update_role(role_id: uuid.UUID, role_in: RoleCreate, request: Request, user:
         raise HTTPException(status_code=404, detail="Role not found")
 
     if role_in.name != role.name:
-        existing_role = db.query(Role).filter(Role.name == role_in.name).first()
-        if existing_role:
+        name_taken = db.query(
+            db.query(Role.id).filter(Role.name == role_in.name).exists()
+        ).scalar()
+        if name_taken:
             raise HTTPException(status_code=400, detail="Role name already exists")
 
     old_val = {"name": role.name}
     for field, value in role_in.model_dump().items():
         setattr(role, field, value)
+    # Every column is already loaded; snapshot before commit expires it.
+    role_out = RoleOut.model_validate(role)
 
     db.commit()
-    db.refresh(role)
+    role_cache_service.invalidate()
     log_audit_event(
         db,
         request=request,
@@ -80,7 +90,7 @@ def update_role(role_id: uuid.UUID, role_in: RoleCreate, request: Request, user:
         new_value=role_in.model_dump(),
         actor_user_id=user.id,
     )
-    return create_success_response(role, "Role updated successfully")
+    return create_success_response(role_out, "Role updated successfully")
 
 @router.delete("/{role_id}", response_model=SuccessResponse[dict],include_in_schema=False)
 def delete_role(role_id: uuid.UUID, request: Request, user: User = Depends(require_admin), db: Session = Depends(get_db)):
@@ -92,6 +102,7 @@ def delete_role(role_id: uuid.UUID, request: Request, user: User = Depends(requi
     old_val = {"name": role.name}
     db.delete(role)
     db.commit()
+    role_cache_service.invalidate()
     log_audit_event(
         db,
         request=request,
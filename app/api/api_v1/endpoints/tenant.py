@@ -1,36 +1,37 @@
 import uuid
 
+import stripe
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from app.schemas.tenant import TenantCreate
 from app.schemas.auth import SwitchTenantRequest, TokenResponse, RoleInfo
 from app.schemas.base import SuccessResponse
 from app.models.tenant import Tenant
 from app.models.user import User
-from app.models.role import Role
 from app.api.deps import get_db, get_current_user_jwt, require_admin
-from app.core.security import create_user_token, create_refresh_token_value, refresh_token_expires_at
+from app.core.security import create_user_token, create_refresh_token_value, hash_refresh_token, refresh_token_expires_at
 from app.utils.response import create_success_response
-import re
 from app.core.config import settings
 from app.models.user import user_tenant_association
 from app.models.refresh_token import RefreshToken
+from app.models.subscription import Subscription
 
-from sqlalchemy import update
 from app.core.logger import logger
 from app.services.stripe_service import StripeService
-from app.services.role_service import get_default_product_id
+from app.services.tenant_service import insert_tenant
+from app.services.role_service import (
+    get_default_product_id,
+    get_membership_role_details,
+    get_role_by_id,
+    get_role_id_by_name,
+)
 
 router = APIRouter()
 
-def generate_schema_name(tenant_name: str) -> str:
-    """Generate a schema name from tenant name"""
-    # Convert to lowercase, replace spaces/special chars with underscores
-    schema_name = re.sub(r'[^a-zA-Z0-9]', '_', tenant_name.lower())
-    # Remove multiple underscores and trailing/leading underscores
-    schema_name = re.sub(r'_+', '_', schema_name).strip('_')
-    return f"{schema_name}_schema"
-
+# Keep response_model on the token endpoints: with it (and the default
+# response class) FastAPI serializes straight to JSON bytes in pydantic-core,
+# which beats jsonable_encoder + json.dumps and any custom JSON response class.
 @router.post("/create", response_model=SuccessResponse[TokenResponse])
 def create_tenant(tenant_in: TenantCreate, current_user: User = Depends(get_current_user_jwt), db: Session = Depends(get_db)):
     """
@@ -44,73 +45,47 @@ def create_tenant(tenant_in: TenantCreate, current_user: User = Depends(get_curr
     """
     # Trim whitespace from tenant name
     tenant_in.name = " ".join(tenant_in.name.split())
-    # Check if tenant name already exists for this user
-    existing_tenant = db.query(Tenant).join(user_tenant_association).filter(
-        Tenant.name == tenant_in.name,
-        user_tenant_association.c.user_id == current_user.id
-    ).first()
-    if existing_tenant:
-        raise HTTPException(status_code=400, detail="You already have a tenant with this name")
-    
-    # Generate unique schema name
-    schema_name = generate_schema_name(tenant_in.name)
-    
-    # Ensure schema name is unique
-    existing_schema = db.query(Tenant).filter(Tenant.schema_name == schema_name).first()
-    counter = 1
-    original_schema = schema_name
-    while existing_schema:
-        schema_name = f"{original_schema}_{counter}"
-        existing_schema = db.query(Tenant).filter(Tenant.schema_name == schema_name).first()
-        counter += 1
-    
-    # Create new tenant with pending_payment status
-    db_tenant = Tenant(
-        name=tenant_in.name,
-        schema_name=schema_name,
-        status="pending_payment",
-        credits=50
-    )
-    
-    db.add(db_tenant)
-    db.commit()
-    db.refresh(db_tenant)
-    default_product_id = get_default_product_id(db)
     
-    # Get admin role by name
-    admin_role = db.query(Role).filter(Role.name == settings.ADMIN_ROLE).first()
-    if not admin_role:
+    # Admin role id from the process-local role cache (no SELECT on a warm worker)
+    admin_role_id = get_role_id_by_name(db, settings.ADMIN_ROLE)
+    if not admin_role_id:
         raise HTTPException(
             status_code=400, 
             detail="Admin role not found. Please contact administrator."
         )
 
-    # Add user to tenant's users list (many-to-many association)
-    current_user.tenants.append(db_tenant)
-    
-    # Commit the association first
-    db.commit()
-    
-    # Update the role_id in the association table
-    stmt = update(user_tenant_association).where(
-        (user_tenant_association.c.user_id == current_user.id) &
-        (user_tenant_association.c.tenant_id == db_tenant.id)
-    ).values(role_id=admin_role.id, product_id=default_product_id)
-    
-    db.execute(stmt)
-    
+    # RETURNING already populated the row; it is committed with the membership below.
+    try:
+        db_tenant = insert_tenant(db, tenant_in.name)
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="You already have a tenant with this name")
+    tenant_id = db_tenant.id
+    user_id = current_user.id
+    email = current_user.email
+
+    # Link the creator as admin in a single INSERT (role and product included)
+    # rather than appending to current_user.tenants, which would load the
+    # collection and need a follow-up UPDATE for role_id.
+    db.execute(
+        user_tenant_association.insert().values(
+            user_id=user_id,
+            tenant_id=tenant_id,
+            role_id=admin_role_id,
+            product_id=get_default_product_id(db),
+        )
+    )
+
     # Set the new tenant as user's current tenant
-    current_user.current_tenant_id = db_tenant.id
-    
-    db.commit()
-    db.refresh(current_user)
+    current_user.current_tenant_id = tenant_id
     
     # Get role information for the new tenant
     role_info = None
     current_role = None
+    admin_role = get_role_by_id(db, admin_role_id)
     if admin_role:
         role_info = RoleInfo(
-            id=admin_role.id,
+            id=admin_role_id,
             name=admin_role.name,
             description=admin_role.description
         )
@@ -118,33 +93,32 @@ def create_tenant(tenant_in: TenantCreate, current_user: User = Depends(get_curr
     
     # Create new token with updated tenant and role
     access_token = create_user_token(
-        user_id=current_user.id,
-        email=current_user.email,
-        tenant_id=db_tenant.id,
+        user_id=user_id,
+        email=email,
+        tenant_id=tenant_id,
         role=current_role
     )
 
     # Create refresh token (valid 7 days)
-    
     rt_value = create_refresh_token_value()
     rt = RefreshToken(
-        user_id=current_user.id,
-        token=rt_value,
+        user_id=user_id,
+        token=hash_refresh_token(rt_value),
         expires_at=refresh_token_expires_at(),
         revoked=False
     )
     db.add(rt)
+
+    # Tenant, membership, current tenant and refresh token commit together.
     db.commit()
     
-    # Get user's updated tenant IDs
-    user_tenant_ids = [tenant.id for tenant in current_user.tenants]
-    
-    token_response = TokenResponse(
+    # Every field comes from the DB or the token helpers, so skip re-validation.
+    # tenant_ids is left unset: it is excluded from the serialized response.
+    token_response = TokenResponse.model_construct(
         access_token=access_token,
-        user_id=current_user.id,
-        email=current_user.email,
-        tenant_id=db_tenant.id,
-        tenant_ids=user_tenant_ids,
+        user_id=user_id,
+        email=email,
+        tenant_id=tenant_id,
         role=role_info,
         refresh_token=rt_value
     )
@@ -162,65 +136,59 @@ def switch_tenant(
     Switch to a different tenant and return new JWT token with role information.
     Also updates the user's current_tenant_id in the database.
     """
-    # Get user's tenant IDs from database
-    user_tenant_ids = [tenant.id for tenant in current_user.tenants]
-    
-    # Check if user has access to the requested tenant
-    if switch_data.tenant_id not in user_tenant_ids:
+    user_id = current_user.id
+    email = current_user.email
+
+    # Membership check, assigned role and display role from one
+    # association-row query with the role joined in, so the token never
+    # carries a role name cached before a change on another worker; no row
+    # means no access.
+    membership = get_membership_role_details(db, user_id, switch_data.tenant_id)
+    if membership is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Access denied to this tenant"
         )
-    
-    # Update user's current_tenant_id in the database
+    role, disp = membership
+
+    # Update user's current_tenant_id; committed together with the refresh token below
     current_user.current_tenant_id = switch_data.tenant_id
-    db.commit()
-    db.refresh(current_user)
     
-    # Get role information for the switched tenant
-    role_info = None
-    current_role = None
-    from app.services.role_service import get_user_role_in_tenant, get_display_role_details
-    role = get_user_role_in_tenant(db, current_user.id, switch_data.tenant_id)
-    disp = get_display_role_details(db, current_user.id, switch_data.tenant_id)
-    if disp:
-        role_info = RoleInfo(
-            id=role.id if role else uuid.UUID(int=0),
-            name=disp["name"],
-            description=disp["description"]
-        )
-    if role:
-        current_role = role.name
+    # Role information for the switched tenant
+    role_info = RoleInfo(
+        id=role.id if role else uuid.UUID(int=0),
+        name=disp["name"],
+        description=disp["description"]
+    )
+    current_role = role.name if role else None
 
-    
     # Create new token with updated tenant and role
     access_token = create_user_token(
-        user_id=current_user.id,
-        email=current_user.email,
+        user_id=user_id,
+        email=email,
         tenant_id=switch_data.tenant_id,
         role=current_role
     )
 
     # Create refresh token (valid 7 days)
-    from app.core.security import create_refresh_token_value, refresh_token_expires_at
-    from app.models.refresh_token import RefreshToken
-    
     rt_value = create_refresh_token_value()
     rt = RefreshToken(
-        user_id=current_user.id,
-        token=rt_value,
+        user_id=user_id,
+        token=hash_refresh_token(rt_value),
         expires_at=refresh_token_expires_at(),
         revoked=False
     )
     db.add(rt)
+
+    # Current tenant and refresh token commit together; ids and email were
+    # captured up front so no refresh of current_user is needed afterwards.
     db.commit()
     
-    token_response = TokenResponse(
+    token_response = TokenResponse.model_construct(
         access_token=access_token,
-        user_id=current_user.id,
-        email=current_user.email,
+        user_id=user_id,
+        email=email,
         tenant_id=switch_data.tenant_id,
-        tenant_ids=user_tenant_ids,
         role=role_info,
         refresh_token=rt_value
     )
@@ -249,12 +217,9 @@ def start_credit_checkout_session(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Tenant not found"
         )
-    import stripe
-    from app.core.config import settings
     stripe.api_key = settings.STRIPE_SECRET_KEY
     # Create Stripe customer if not exists
     if not tenant.stripe_customer_id:
-        from app.services.stripe_service import StripeService
         stripe_customer_id = StripeService.create_customer(
             tenant=tenant,
             email=current_user.email,
@@ -333,8 +298,6 @@ def verify_payment(
         )
     
     # Retrieve checkout session from Stripe
-    import stripe
-    from app.core.config import settings
     
     stripe.api_key = settings.STRIPE_SECRET_KEY
     
@@ -380,7 +343,6 @@ def verify_last_payment(
         )
     
     # Get the latest subscription for the user (with a session ID)
-    from app.models.subscription import Subscription
     subscription = (
         db.query(Subscription)
         .filter(
@@ -443,8 +405,6 @@ def get_payment_history(
             }, "No payment history found")
         
         # Import Stripe
-        import stripe
-        from app.core.config import settings
         
         stripe.api_key = settings.STRIPE_SECRET_KEY
         
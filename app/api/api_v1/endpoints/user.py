@@ -1,115 +1,131 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from sqlalchemy import update
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.exc import IntegrityError
 from app.schemas.user import UserCreate, UserOut, UserProfile, UserUpdate, TenantMember
 from app.schemas.auth import LoginRequest, TokenResponse, RoleInfo, ForgotPasswordRequest, ForgotPasswordResponse, ResetPasswordRequest, ResetPasswordResponse
 from app.schemas.auth import RefreshRequest, GoogleLoginRequest
 from app.schemas.base import SuccessResponse
 from app.models.user import User, user_tenant_association
 from app.models.password_reset import PasswordResetToken
-from app.models.role import Role
 from app.models.tenant import Tenant
 from app.models.refresh_token import RefreshToken
+from app.db.session import SessionLocal
 from app.api.deps import (
     get_db,
     get_active_user_by_id,
     get_current_user_jwt,
+    get_current_user_with_tenants_jwt,
+    get_current_token_claims,
     require_member_or_admin,
     security,
     issue_tokens_for_user,
+    get_request_now,
 )
-from app.core.security import verify_password, create_user_token, pwd_context, create_password_reset_token, get_password_hash
-from app.core.security import create_refresh_token_value, refresh_token_expires_at
-from app.core.security import is_token_expired, verify_token
+from app.core.security import verify_password, verify_dummy_password, password_needs_rehash, create_user_token, create_password_reset_token, hash_password_reset_token, get_password_hash
+from app.core.security import create_refresh_token_value, hash_refresh_token, refresh_token_expires_at
+from app.core.security import get_token_info, is_token_expired, payload_expired, verify_token
 from app.services.email_service import email_service
 from app.utils.response import create_success_response
 from datetime import datetime, timezone
-from app.services.role_service import get_user_role_in_tenant
+from app.services.role_service import (
+    get_display_role_details,
+    get_user_memberships,
+    get_user_product_in_tenant,
+    get_user_role_in_tenant,
+    resolve_membership_role,
+)
+from app.services.tenant_service import insert_tenant
 from google.oauth2 import id_token as google_id_token
 from google.auth.transport.requests import Request as GoogleRequest
 from app.core.config import settings
 import uuid
-import re
 from app.core.logger import logger
-from app.services.role_service import get_default_product_id
+from app.services.role_service import get_default_product_id, get_role_id_by_name
 from app.utils.rate_limiter import enforce_login_rate_limit
 
 router = APIRouter()
 
 
+def _add_personal_tenant(db: Session, db_user: User) -> None:
+    """
+    Give a freshly flushed user a tenant named after their email, with the
+    owner role, and make it current. Nothing is committed here.
+    """
+    # schema_name collisions get a suffix in the same INSERT path
+    db_tenant = insert_tenant(db, db_user.email)
+
+    # One INSERT for the membership (role and product included) instead of
+    # appending to db_user.tenants, which loads the collection, commits and
+    # then needs a follow-up UPDATE for role_id/product_id.
+    db.execute(
+        user_tenant_association.insert().values(
+            user_id=db_user.id,
+            tenant_id=db_tenant.id,
+            role_id=get_role_id_by_name(db, "owner"),
+            product_id=get_default_product_id(db),
+        )
+    )
+    db_user.current_tenant_id = db_tenant.id
+
+
 @router.post("/register", response_model=SuccessResponse[UserOut])
-def register_user(user_in: UserCreate, db: Session = Depends(get_db)):
+def register_user(
+    user_in: UserCreate,
+    db: Session = Depends(get_db),
+    now: datetime = Depends(get_request_now),
+):
     # Convert email to lowercase
     user_in.email = user_in.email.lower()
-    # Check if email already exists
-    user = db.query(User).filter(User.email == user_in.email).first()
-    if user:
-        raise HTTPException(
-            status_code=400, 
-            detail={
-                "field": "email",
-                "message": "Email already registered",
-                "error_type": "email_already_exists"
-            }
-        )
 
-    hashed_password = pwd_context.hash(user_in.password)
+    hashed_password = get_password_hash(user_in.password)
     db_user = User(
         email=user_in.email,
         first_name=user_in.first_name,
         last_name=user_in.last_name,
         phone=user_in.phone,
         hashed_password=hashed_password,
-        join_date=datetime.now(timezone.utc),
-        created_at=datetime.now(timezone.utc)
+        # Same request clock as accept_invite, and known without a read-back
+        join_date=now,
+        created_at=now,
     )
     db.add(db_user)
+    # No pre-SELECT: the partial unique index on active emails rejects
+    # duplicates atomically, including concurrent registrations.
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=400, 
+            detail={
+                "field": "email",
+                "message": "Email already registered",
+                "error_type": "email_already_exists"
+            }
+        )
+
+    try:
+        _add_personal_tenant(db, db_user)
+    except IntegrityError:
+        # An active tenant already carries this email as its name
+        db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "field": "email",
+                "message": "Email already registered",
+                "error_type": "email_already_exists"
+            }
+        )
+
+    # Every response field is set in Python; snapshot before commit expires it.
+    user_out = UserOut.model_validate(db_user)
+
+    # User, tenant and owner membership commit together.
     db.commit()
-    db.refresh(db_user)
-    
-    # Create tenant automatically with user's email as tenant name
-    tenant_name = user_in.email    
-    # Generate schema name from tenant name
-    schema_name = re.sub(r'[^a-zA-Z0-9]', '_', tenant_name.lower())
-    schema_name = re.sub(r'_+', '_', schema_name).strip('_')
-    schema_name = f"{schema_name}_schema"
-    
-    # Create new tenant
-    db_tenant = Tenant(
-        name=tenant_name,
-        schema_name=schema_name,
-        status="pending_payment",
-        credits=50
-    )
-    
-    db.add(db_tenant)
-    db.commit()
-    db.refresh(db_tenant)
-    default_product_id = get_default_product_id(db)
-    
-    # Get owner role
-    owner_role = db.query(Role).filter(Role.name == "owner").first()
-    
-    # Add user to tenant with owner role
-    db_user.tenants.append(db_tenant)
-    db.commit()
-    
-    # Update the role_id in the association table
-    stmt = update(user_tenant_association).where(
-        (user_tenant_association.c.user_id == db_user.id) &
-        (user_tenant_association.c.tenant_id == db_tenant.id)
-    ).values(role_id=owner_role.id, product_id=default_product_id)
-    
-    db.execute(stmt)
-    
-    # Set the new tenant as user's current tenant
-    db_user.current_tenant_id = db_tenant.id
-    
-    db.commit()
-    db.refresh(db_user)
     
-    return create_success_response(db_user, "User registered successfully", status.HTTP_201_CREATED)
+    return create_success_response(user_out, "User registered successfully", status.HTTP_201_CREATED)
 
 
 @router.post("/login", response_model=SuccessResponse[TokenResponse])
@@ -131,6 +147,9 @@ def login(
         User.deleted_at.is_(None),
     ).first()
     if not user:
+        # Same hashing cost as a real check, so a miss is not answered faster
+        db.rollback()
+        verify_dummy_password(login_data.password)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail={
@@ -140,8 +159,15 @@ def login(
             }
         )
     
-    # Verify password
-    if not verify_password(login_data.password, user.hashed_password):
+    # Verify password. Hashing takes up to ~250 ms at the default cost, so
+    # hand the pooled connection back first: the user is detached so the
+    # rollback does not expire it, then re-attached (no SELECT) for the writes
+    # below.
+    db.expunge(user)
+    db.rollback()
+    password_ok = verify_password(login_data.password, user.hashed_password)
+    db.add(user)
+    if not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail={
@@ -150,73 +176,74 @@ def login(
                 "error_type": "invalid_password"
             }
         )
+    # Upgrade bcrypt (or outdated argon2) hashes while the plaintext is at
+    # hand; committed together with the refresh token below.
+    if password_needs_rehash(user.hashed_password):
+        user.hashed_password = get_password_hash(login_data.password)
     
-    # Get user's tenant IDs
-    tenant_ids = [tenant.id for tenant in user.tenants]
+    user_id = user.id
+    email = user.email
+
+    # Tenant ids plus each membership's role/product in one association query,
+    # instead of loading user.tenants and then querying role and product.
+    memberships = {m.tenant_id: m for m in get_user_memberships(db, user_id)}
+    tenant_ids = list(memberships)
     
     # Determine which tenant to use
     current_tenant_id = None
-    if user.current_tenant_id and user.current_tenant_id in tenant_ids:
+    if user.current_tenant_id and user.current_tenant_id in memberships:
         # Use the user's current tenant if it exists and user has access
         current_tenant_id = user.current_tenant_id
     elif tenant_ids:
         # If no current tenant set, use the first available tenant
         current_tenant_id = tenant_ids[0]
-        # Update user's current_tenant_id
+        # Update user's current_tenant_id; committed with the refresh token below
         user.current_tenant_id = current_tenant_id
-        db.commit()
     
     # Get role information for the current tenant
     role_info = None
     current_role = None
     current_product_id = None
     if current_tenant_id:
-        from app.services.role_service import (
-            get_user_role_in_tenant,
-            get_user_product_in_tenant,
+        membership = memberships[current_tenant_id]
+        # Role name and description were joined into the membership query
+        role, disp = resolve_membership_role(membership)
+        role_info = RoleInfo.model_construct(
+            id=role.id if role else uuid.UUID(int=0),
+            name=disp["name"],
+            description=disp["description"]
         )
-        
-        # Check if user has a role in this tenant
-        role = get_user_role_in_tenant(db, user.id, current_tenant_id)
-        from app.services.role_service import get_display_role_details
-        disp = get_display_role_details(db, user.id, current_tenant_id)
-        if disp:
-            role_info = RoleInfo(
-                id=role.id if role else uuid.UUID(int=0),
-                name=disp["name"],
-                description=disp["description"]
-            )
         if role:
             current_role = role.name
-        product = get_user_product_in_tenant(db, user.id, current_tenant_id)
-        if product:
-            current_product_id = product.id
+        current_product_id = membership.product_id
     
     access_token = create_user_token(
-        user_id=user.id,
-        email=user.email,
+        user_id=user_id,
+        email=email,
         tenant_id=current_tenant_id,
         role=current_role
     )
 
-    # Create refresh token (valid 7 days)
+    # Create refresh token (valid 7 days). One commit covers it together with
+    # any rehashed password and defaulted current tenant above.
     rt_value = create_refresh_token_value()
     rt = RefreshToken(
-        user_id=user.id,
-        token=rt_value,
+        user_id=user_id,
+        token=hash_refresh_token(rt_value),
         expires_at=refresh_token_expires_at(),
         revoked=False
     )
     db.add(rt)
     db.commit()
     
-    token_response = TokenResponse(
+    # Server-built from DB values and token helpers, so skip re-validation.
+    # tenant_ids is left unset: it is excluded from the serialized response.
+    token_response = TokenResponse.model_construct(
         access_token=access_token,
-        user_id=user.id,
-        email=user.email,
+        user_id=user_id,
+        email=email,
         tenant_id=current_tenant_id,
         product_id=current_product_id,
-        tenant_ids=tenant_ids,
         role=role_info,
         refresh_token=rt_value
     )
@@ -284,8 +311,6 @@ def google_login(
             last_name=last_name,
             phone=None,
             hashed_password="",  # provider-based user; no password stored
-            join_date=datetime.now(timezone.utc),
-            created_at=datetime.now(timezone.utc),
             provider="google",
             provider_user_id=sub,
             provider_profile={
@@ -297,95 +322,57 @@ def google_login(
             },
         )
         db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
-
-        # Create a personal tenant (same as normal register)
-        tenant_name = email
-        schema_name = re.sub(r'[^a-zA-Z0-9]', '_', tenant_name.lower())
-        schema_name = re.sub(r'_+', '_', schema_name).strip('_')
-        schema_name = f"{schema_name}_schema"
-
-        db_tenant = Tenant(
-            name=tenant_name,
-            schema_name=schema_name,
-            status="pending_payment",
-            credits=50
-        )
-        db.add(db_tenant)
-        db.commit()
-        db.refresh(db_tenant)
-        default_product_id = get_default_product_id(db)
-
-        owner_role = db.query(Role).filter(Role.name == "owner").first()
+        db.flush()
 
-        db_user.tenants.append(db_tenant)
-        db.commit()
-
-        stmt = update(user_tenant_association).where(
-            (user_tenant_association.c.user_id == db_user.id) &
-            (user_tenant_association.c.tenant_id == db_tenant.id)
-        ).values(role_id=owner_role.id, product_id=default_product_id)
-        db.execute(stmt)
-
-        db_user.current_tenant_id = db_tenant.id
-        db.commit()
-        db.refresh(db_user)
+        # Create a personal tenant (same as normal register); committed with
+        # the refresh token by issue_tokens_for_user
+        _add_personal_tenant(db, db_user)
 
         user = db_user
     else:
         # Update social fields if they were missing/outdated
-        updated = False
         if user.provider != "google":
             user.provider = "google"
-            updated = True
         if not user.provider_user_id and sub:
             user.provider_user_id = sub
-            updated = True
         # Keep names synced from provider when available (no email-based fallback)
         if given_name and user.first_name != given_name:
             user.first_name = given_name
-            updated = True
         if family_name and user.last_name != family_name:
             user.last_name = family_name
-            updated = True
         elif (not family_name) and name:
             parts = name.split()
             if len(parts) > 1 and user.last_name != " ".join(parts[1:]):
                 user.last_name = " ".join(parts[1:])
-                updated = True
         # light profile snapshot
         profile = user.provider_profile or {}
         new_profile = { "name": name, "given_name": given_name, "family_name": family_name, "email": email, "picture": picture }
         if any(profile.get(k) != v for k, v in new_profile.items()):
             user.provider_profile = { **profile, **new_profile }
-            updated = True
-        if updated:
-            db.add(user)
-            db.commit()
-            db.refresh(user)
+        # Unchanged attributes aren't dirty; any changes are flushed by
+        # issue_tokens_for_user's commit, with the refresh token.
 
-    # Tenant context and role resolution
-    tenant_ids = [t.id for t in user.tenants]
+    # Tenant context and role resolution: tenant ids and role come from the
+    # membership rows, without hydrating Tenant objects via user.tenants
+    memberships = {m.tenant_id: m for m in get_user_memberships(db, user.id)}
+    tenant_ids = list(memberships)
     current_tenant_id = None
-    if user.current_tenant_id and user.current_tenant_id in tenant_ids:
+    if user.current_tenant_id and user.current_tenant_id in memberships:
         current_tenant_id = user.current_tenant_id
     elif tenant_ids:
         current_tenant_id = tenant_ids[0]
+        # Flushed by issue_tokens_for_user's commit, with the refresh token
         user.current_tenant_id = current_tenant_id
-        db.commit()
 
     role_info = None
     if current_tenant_id:
-        role = get_user_role_in_tenant(db, user.id, current_tenant_id)
-        from app.services.role_service import get_display_role_details
-        disp = get_display_role_details(db, user.id, current_tenant_id)
-        if disp:
-            role_info = RoleInfo(
-                id=role.id if role else uuid.UUID(int=0),
-                name=disp["name"],
-                description=disp["description"]
-            )
+        membership = memberships[current_tenant_id]
+        role, disp = resolve_membership_role(membership)
+        role_info = RoleInfo.model_construct(
+            id=role.id if role else uuid.UUID(int=0),
+            name=disp["name"],
+            description=disp["description"]
+        )
 
     # Issue tokens (provider-based; no password needed)
     token_response = issue_tokens_for_user(db, user, current_tenant_id, role_info)
@@ -393,19 +380,16 @@ def google_login(
     return create_success_response(token_response, "Login successful via Google")
 
 
-def _expires_at_utc_aware(expires_at: datetime) -> datetime:
-    """SQLite may return naive datetimes; Postgres uses tz-aware. Normalize for comparison."""
-    if expires_at.tzinfo is None:
-        return expires_at.replace(tzinfo=timezone.utc)
-    return expires_at
-
-
 @router.post("/refresh")
-def refresh_tokens(req: RefreshRequest, db: Session = Depends(get_db)):
+def refresh_tokens(
+    req: RefreshRequest,
+    db: Session = Depends(get_db),
+    now_utc: datetime = Depends(get_request_now),
+):
     """
     Refresh endpoint with token rotation and replay detection:
     1) If access_token is provided and still valid -> return "still valid" (no rotation)
-    2) If refresh_token is revoked or already rotated -> replay attack: revoke all user tokens, 401
+    2) If an unexpired refresh_token is revoked or already rotated -> replay attack: revoke all user tokens, 401
     3) If refresh_token valid -> issue new access_token + rotate refresh_token
     4) If refresh_token invalid/expired -> 401
     """
@@ -413,7 +397,7 @@ def refresh_tokens(req: RefreshRequest, db: Session = Depends(get_db)):
     # 1) If access token is still valid (and user is not soft-deleted)
     if req.access_token:
         payload = verify_token(req.access_token)
-        if payload and not is_token_expired(req.access_token):
+        if not payload_expired(payload):
             user_id_str = payload.get("user_id")
             if user_id_str:
                 try:
@@ -430,10 +414,13 @@ def refresh_tokens(req: RefreshRequest, db: Session = Depends(get_db)):
                 "message": "Access token still valid"
             }
 
-    now_utc = datetime.now(timezone.utc)
-
-    # 2) Look up the token regardless of revocation state so we can detect replays
-    rt = db.query(RefreshToken).filter(RefreshToken.token == req.refresh_token).first()
+    # 2) Look up the unexpired token regardless of revocation state so we can
+    # detect replays; expired tokens are filtered out by the database and get
+    # the same 401 as unknown ones. Its user is joined in for step 3.
+    rt = db.query(RefreshToken).options(joinedload(RefreshToken.user)).filter(
+        RefreshToken.token == hash_refresh_token(req.refresh_token),
+        RefreshToken.expires_at > now_utc,
+    ).first()
 
     if not rt:
         raise HTTPException(
@@ -460,55 +447,52 @@ def refresh_tokens(req: RefreshRequest, db: Session = Depends(get_db)):
             detail="Invalid or expired session"
         )
 
-    # Legitimately expired (not a replay — token was never used)
-    if _expires_at_utc_aware(rt.expires_at) <= now_utc:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired session"
-        )
-
-    # 3) Valid token — load user and tenant context
-    user = get_active_user_by_id(db, rt.user_id)
+    # 3) Valid token — user (loaded with the token) and tenant context
+    user = rt.user if rt.user is not None and rt.user.deleted_at is None else None
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found or account has been deactivated",
         )
 
-    tenant_ids = [t.id for t in user.tenants]
-    current_tenant_id = user.current_tenant_id if user.current_tenant_id in tenant_ids else (tenant_ids[0] if tenant_ids else None)
+    user_id = user.id
+    email = user.email
+
+    # Same single membership query as login (no user.tenants lazy load)
+    memberships = {m.tenant_id: m for m in get_user_memberships(db, user_id)}
+    tenant_ids = list(memberships)
+    current_tenant_id = user.current_tenant_id if user.current_tenant_id in memberships else (tenant_ids[0] if tenant_ids else None)
 
     role_info = None
     current_role: str | None = None
     if current_tenant_id:
-        role = get_user_role_in_tenant(db, user.id, current_tenant_id)
-        from app.services.role_service import get_display_role_details
-        disp = get_display_role_details(db, user.id, current_tenant_id)
-        if disp:
-            role_info = RoleInfo(
-                id=role.id if role else uuid.UUID(int=0),
-                name=disp["name"],
-                description=disp["description"]
-            )
+        membership = memberships[current_tenant_id]
+        role, disp = resolve_membership_role(membership)
+        role_info = RoleInfo.model_construct(
+            id=role.id if role else uuid.UUID(int=0),
+            name=disp["name"],
+            description=disp["description"]
+        )
         if role:
             current_role = role.name
 
     # Issue fresh access token
     new_access_token = create_user_token(
-        user_id=user.id,
-        email=user.email,
+        user_id=user_id,
+        email=email,
         tenant_id=current_tenant_id,
         role=current_role,
     )
 
     # Rotate: revoke old token and create replacement
     new_rt_value = create_refresh_token_value()
+    new_rt_hash = hash_refresh_token(new_rt_value)
     rt.revoked = True
-    rt.replaced_by_token = new_rt_value
+    rt.replaced_by_token = new_rt_hash
 
     new_rt = RefreshToken(
-        user_id=user.id,
-        token=new_rt_value,
+        user_id=user_id,
+        token=new_rt_hash,
         expires_at=refresh_token_expires_at(),
         revoked=False,
     )
@@ -530,8 +514,8 @@ def refresh_tokens(req: RefreshRequest, db: Session = Depends(get_db)):
             "access_token": new_access_token,
             "refresh_token": new_rt_value,
             "token_type": "bearer",
-            "user_id": user.id,
-            "email": user.email,
+            "user_id": user_id,
+            "email": email,
             "tenant_id": current_tenant_id,
             "tenant_ids": tenant_ids,
             "role": role_info
@@ -540,20 +524,18 @@ def refresh_tokens(req: RefreshRequest, db: Session = Depends(get_db)):
 
 
 @router.post("/logout", response_model=SuccessResponse[dict])
-def logout(current_user: User = Depends(get_current_user_jwt), db: Session = Depends(get_db)):
+def logout(claims: dict = Depends(get_current_token_claims), db: Session = Depends(get_db)):
     """
     Logout endpoint: revoke all active refresh tokens for the user.
     Note: Access JWTs are stateless and cannot be revoked server-side.
     """
-    # Find and revoke all active refresh tokens for the user
-    active_tokens = db.query(RefreshToken).filter(
-        RefreshToken.user_id == current_user.id,
+    # Only the user id is needed, so it comes from the verified token claims
+    # rather than a user-row lookup. One UPDATE, no rows loaded into the ORM.
+    db.query(RefreshToken).filter(
+        RefreshToken.user_id == claims["user_id"],
         ~RefreshToken.revoked,
         RefreshToken.expires_at > datetime.now(timezone.utc)
-    ).all()
-    
-    for token in active_tokens:
-        token.revoked = True
+    ).update({RefreshToken.revoked: True}, synchronize_session=False)
     
     db.commit()
     return create_success_response({"message": "Successfully logged out"}, "Logout successful")
@@ -564,9 +546,6 @@ def get_token_information(
     db: Session = Depends(get_db),
 ):
     """Get detailed information about the current token including expiration"""
-    from app.core.security import get_token_info
-    from app.services.role_service import get_user_product_in_tenant
-    
     token = credentials.credentials
     token_info = get_token_info(token)
     
@@ -601,12 +580,12 @@ def get_token_information(
     }, "Token information retrieved successfully")
 
 @router.get("/check-token-expiration", response_model=SuccessResponse[dict])
-def check_token_expiration(
+async def check_token_expiration(
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ):
     """Check if the current token is expired"""
-    from app.core.security import is_token_expired
-    
+    # async def: no DB or blocking I/O here, only an in-memory JWT decode,
+    # so it runs on the event loop instead of taking a threadpool slot.
     token = credentials.credentials
     is_expired = is_token_expired(token)
     
@@ -623,7 +602,7 @@ def check_token_expiration(
 
 @router.get("/my-tenants", response_model=SuccessResponse[dict])
 def get_user_tenants(
-    user: User = Depends(get_current_user_jwt),
+    user: User = Depends(get_current_user_with_tenants_jwt),
     db: Session = Depends(get_db)
 ):
     """
@@ -648,14 +627,46 @@ def get_user_tenants(
         "current_tenant_id": user.current_tenant_id
     }, "User tenants retrieved successfully")
 
+def _send_password_reset_email_task(
+    reset_token_id: uuid.UUID,
+    email: str,
+    reset_token: str,
+    user_name: str,
+) -> None:
+    """Send the reset email after the response; retire the token if delivery fails."""
+    if email_service.send_password_reset_email(
+        email=email,
+        reset_token=reset_token,
+        user_name=user_name,
+    ):
+        return
+
+    db = SessionLocal()
+    try:
+        db.query(PasswordResetToken).filter(
+            PasswordResetToken.id == reset_token_id,
+        ).update({PasswordResetToken.used: True}, synchronize_session=False)
+        db.commit()
+    except Exception as exc:
+        db.rollback()
+        logger.error(f"Failed to retire password reset token {reset_token_id}: {exc}")
+    finally:
+        db.close()
+
+
 @router.post("/forgot-password", response_model=SuccessResponse[ForgotPasswordResponse])
-def forgot_password(request: ForgotPasswordRequest, db: Session = Depends(get_db)):
+def forgot_password(
+    request: ForgotPasswordRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+):
     """
     Send password reset email to user
     """
-    # Find active user by email (soft-deleted accounts cannot reset password)
+    # Find active user by email (soft-deleted accounts cannot reset password).
+    # Emails are stored lowercased, so an exact match hits uq_user_email_active.
     user = db.query(User).filter(
-        User.email == request.email,
+        User.email == request.email.lower(),
         User.deleted_at.is_(None),
     ).first()
 
@@ -670,66 +681,59 @@ def forgot_password(request: ForgotPasswordRequest, db: Session = Depends(get_db
             }
         )
     
-    # Invalidate any existing reset tokens for this user
-    existing_tokens = db.query(PasswordResetToken).filter(
-        PasswordResetToken.user_id == user.id,
+    user_id = user.id
+    email = user.email
+    user_name = f"{user.first_name} {user.last_name}".strip() or email
+
+    # Invalidate any existing reset tokens for this user (single UPDATE)
+    db.query(PasswordResetToken).filter(
+        PasswordResetToken.user_id == user_id,
         ~PasswordResetToken.used
-    ).all()
-    
-    for token in existing_tokens:
-        token.used = True
+    ).update({PasswordResetToken.used: True}, synchronize_session=False)
     
     # Create new reset token
-    reset_token, expires_at = create_password_reset_token(user.id)
-    
-    # Save token to database
-    db_reset_token = PasswordResetToken(
-        user_id=user.id,
-        token=reset_token,
+    reset_token, expires_at = create_password_reset_token(user_id)
+    
+    # Save token to database; committed before the email task can run
+    reset_token_id = uuid.uuid4()
+    db.add(PasswordResetToken(
+        id=reset_token_id,
+        user_id=user_id,
+        token=hash_password_reset_token(reset_token),
         expires_at=expires_at,
         used=False
-    )
-    db.add(db_reset_token)
+    ))
     db.commit()
     
-    # Send email
-    user_name = f"{user.first_name} {user.last_name}".strip()
-    if not user_name:
-        user_name = user.email
-    
-    email_sent = email_service.send_password_reset_email(
-        email=user.email,
-        reset_token=reset_token,
-        user_name=user_name
+    # SMTP delivery runs after the response so it does not hold the worker or
+    # the DB connection; the token is retired if the send fails.
+    background_tasks.add_task(
+        _send_password_reset_email_task,
+        reset_token_id,
+        email,
+        reset_token,
+        user_name,
+    )
+
+    return create_success_response(
+        ForgotPasswordResponse(message="Password reset email sent successfully."),
+        "Password reset email sent"
     )
-    
-    if email_sent:
-        return create_success_response(
-            ForgotPasswordResponse(message="Password reset email sent successfully."),
-            "Password reset email sent"
-        )
-    else:
-        # If email fails, mark token as used
-        db_reset_token.used = True
-        db.commit()
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={
-                "message": "Failed to send password reset email. Please try again later.",
-                "error_type": "email_send_failed"
-            }
-        )
 
 @router.post("/reset-password", response_model=SuccessResponse[ResetPasswordResponse])
-def reset_password(request: ResetPasswordRequest, db: Session = Depends(get_db)):
+def reset_password(
+    request: ResetPasswordRequest,
+    db: Session = Depends(get_db),
+    now: datetime = Depends(get_request_now),
+):
     """
     Reset password using reset token and revoke all refresh tokens
     """
     # Find valid reset token
     reset_token = db.query(PasswordResetToken).filter(
-        PasswordResetToken.token == request.token,
+        PasswordResetToken.token == hash_password_reset_token(request.token),
         ~PasswordResetToken.used,
-        PasswordResetToken.expires_at > datetime.now(timezone.utc)
+        PasswordResetToken.expires_at > now
     ).first()
     
     if not reset_token:
@@ -757,15 +761,12 @@ def reset_password(request: ResetPasswordRequest, db: Session = Depends(get_db))
     # Mark token as used
     reset_token.used = True
 
-    # Revoke all user's refresh tokens on password change
-    active_rts = db.query(RefreshToken).filter(
+    # Revoke all user's refresh tokens on password change (single UPDATE)
+    db.query(RefreshToken).filter(
         RefreshToken.user_id == user.id,
         ~RefreshToken.revoked,
-        RefreshToken.expires_at > datetime.now(timezone.utc)
-    ).all()
-    
-    for token in active_rts:
-        token.revoked = True
+        RefreshToken.expires_at > now
+    ).update({RefreshToken.revoked: True}, synchronize_session=False)
     
     db.commit()
     
@@ -777,7 +778,7 @@ def reset_password(request: ResetPasswordRequest, db: Session = Depends(get_db))
 
 @router.get("/profile", response_model=SuccessResponse[UserProfile])
 def get_user_profile(
-    current_user: User = Depends(get_current_user_jwt),
+    current_user: User = Depends(get_current_user_with_tenants_jwt),
     db: Session = Depends(get_db)
 ):
     """
@@ -797,7 +798,6 @@ def get_user_profile(
     role_info = None
     if user.current_tenant_id:
         role = get_user_role_in_tenant(db, user.id, user.current_tenant_id)
-        from app.services.role_service import get_display_role_details
         disp = get_display_role_details(db, user.id, user.current_tenant_id)
         if disp:
             role_info = RoleInfo(
@@ -848,11 +848,13 @@ def update_user_profile(
     if "email" in update_data:
         new_email = update_data["email"]
         if new_email != current_user.email:
-            existing_user = db.query(User).filter(
-                User.email == new_email,
-                User.id != current_user.id
-            ).first()
-            if existing_user:
+            email_taken = db.query(
+                db.query(User.id).filter(
+                    User.email == new_email,
+                    User.id != current_user.id
+                ).exists()
+            ).scalar()
+            if email_taken:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Email already exists"
@@ -861,21 +863,10 @@ def update_user_profile(
     for field, value in update_data.items():
         setattr(current_user, field, value)
     
-    try:
-        db.commit()
-        db.refresh(current_user)
-    except Exception:
-        db.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to update profile"
-        )
-    
     # Get role information for the current tenant
     role_info = None
     if current_user.current_tenant_id:
         role = get_user_role_in_tenant(db, current_user.id, current_user.current_tenant_id)
-        from app.services.role_service import get_display_role_details
         disp = get_display_role_details(db, current_user.id, current_user.current_tenant_id)
         if disp:
             role_info = RoleInfo(
@@ -884,7 +875,9 @@ def update_user_profile(
                 description=disp["description"]
             )
 
-    # Create updated user profile response
+    # Build the response from the in-session values before committing: the
+    # commit expires current_user, and re-reading it afterwards would only
+    # return what was just written.
     user_profile = UserProfile(
         id=current_user.id,
         first_name=current_user.first_name,
@@ -902,6 +895,15 @@ def update_user_profile(
         tenants=[t for t in current_user.tenants if t.deleted_at is None]
     )
 
+    try:
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to update profile"
+        )
+
     return create_success_response(
         user_profile,
         "User profile updated successfully"
@@ -936,7 +938,6 @@ def get_tenant_members(
         # Get role information for this user in the current tenant
         role = get_user_role_in_tenant(db, user.id, current_user.current_tenant_id)
         role_info = None
-        from app.services.role_service import get_display_role_details
         disp = get_display_role_details(db, user.id, current_user.current_tenant_id)
         if disp:
             role_info = RoleInfo(
@@ -64,10 +64,12 @@ def _repository(db: Session = Depends(get_db)) -> WorkspaceRepository:
     return WorkspaceRepository(db)
 
 
-_DB_ERROR = HTTPException(
-    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-    detail="Database error",
-)
+def _db_error() -> HTTPException:
+    # New instance per raise; a shared one accumulates tracebacks.
+    return HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail="Database error",
+    )
 
 
 def _workspace_id(principal: User | ApiKeyPrincipal) -> uuid.UUID:
@@ -163,7 +165,7 @@ def create_workspace(
         )
     except SQLAlchemyError as exc:
         logger.error("Workspace create DB error: %s", exc, exc_info=True)
-        raise _DB_ERROR
+        raise _db_error()
 
     log_audit_event(
         db,
@@ -195,7 +197,7 @@ def get_workspace_by_id(
         tenant = repo.find_by_id(workspace_id)
     except SQLAlchemyError as exc:
         logger.error("Workspace get DB error: %s", exc, exc_info=True)
-        raise _DB_ERROR
+        raise _db_error()
 
     if tenant is None:
         raise HTTPException(
@@ -263,7 +265,7 @@ def update_workspace_name(
         )
     except SQLAlchemyError as exc:
         logger.error("Workspace update DB error: %s", exc, exc_info=True)
-        raise _DB_ERROR
+        raise _db_error()
 
     log_audit_event(
         db,
@@ -408,7 +410,7 @@ def soft_delete_workspace(
         raise
     except SQLAlchemyError as exc:
         logger.error("Workspace delete DB error: %s", exc, exc_info=True)
-        raise _DB_ERROR
+        raise _db_error()
 
     log_audit_event(
         db,
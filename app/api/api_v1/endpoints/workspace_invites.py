@@ -8,13 +8,15 @@ from __future__ import annotations
 
 import secrets
 import uuid
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timedelta
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
+from app.core.logger import logger
 from app.core.request_auth import ApiKeyPrincipal, is_api_key_principal
-from app.api.deps import get_db, require_admin_or_api_key
+from app.api.deps import get_db, get_request_now, require_admin_or_api_key
+from app.db.session import SessionLocal
 from app.models.invite import Invite
 from app.models.role import Role
 from app.models.tenant import Tenant
@@ -27,11 +29,43 @@ from app.utils.response import create_success_response
 router = APIRouter()
 
 
+def _send_invite_email_task(
+    invite_id: uuid.UUID,
+    email: str,
+    invite_token: str,
+    inviter_name: str,
+    tenant_name: str,
+) -> None:
+    """Send the invitation after the response; mark the invite send_failed if delivery fails."""
+    if email_service.send_invite_email(
+        email=email,
+        invite_token=invite_token,
+        inviter_name=inviter_name,
+        tenant_name=tenant_name,
+    ):
+        return
+
+    db = SessionLocal()
+    try:
+        db.query(Invite).filter(
+            Invite.id == invite_id,
+            Invite.status == "pending",
+        ).update({"status": "send_failed"}, synchronize_session=False)
+        db.commit()
+    except Exception as exc:
+        db.rollback()
+        logger.error(f"Failed to mark invite {invite_id} as send_failed: {exc}")
+    finally:
+        db.close()
+
+
 @router.post("/invite", response_model=SuccessResponse[InviteOut], status_code=201)
 def invite_team_member(
     body: InviteCreate,
+    background_tasks: BackgroundTasks,
     admin: User | ApiKeyPrincipal = Depends(require_admin_or_api_key),
     db: Session = Depends(get_db),
+    now: datetime = Depends(get_request_now),
 ) -> SuccessResponse[InviteOut]:
     tenant_id: uuid.UUID = admin.current_tenant_id
 
@@ -39,16 +73,16 @@ def invite_team_member(
     if not tenant:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tenant not found")
 
-    existing = (
-        db.query(Invite)
+    pending_exists = db.query(
+        db.query(Invite.id)
         .filter(
             Invite.email == body.email,
             Invite.tenant_id == tenant_id,
             Invite.status == "pending",
         )
-        .first()
-    )
-    if existing:
+        .exists()
+    ).scalar()
+    if pending_exists:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="A pending invitation already exists for this email in this workspace",
@@ -100,7 +134,7 @@ def invite_team_member(
         invited_by=invited_by_id,
         role_id=role_id,
         token=token,
-        expires_at=datetime.now(timezone.utc) + timedelta(days=7),
+        expires_at=now + timedelta(days=7),
         status="pending",
     )
 
@@ -108,18 +142,16 @@ def invite_team_member(
     db.commit()
     db.refresh(invite)
 
-    if not email_service.send_invite_email(
-        email=body.email,
-        invite_token=token,
-        inviter_name=inviter_name,
-        tenant_name=tenant.name,
-    ):
-        db.delete(invite)
-        db.commit()
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to send invitation email",
-        )
+    # SMTP delivery runs after the response so it does not hold the worker or
+    # the DB connection; the committed invite is flagged if the send fails.
+    background_tasks.add_task(
+        _send_invite_email_task,
+        invite.id,
+        body.email,
+        token,
+        inviter_name,
+        tenant.name,
+    )
 
     return create_success_response(
         InviteOut.model_validate(invite),
@@ -21,6 +21,8 @@ from app.api.deps.auth import (
     _user_from_middleware_jwt,
     _principal_from_middleware_api_key,
     get_current_user_jwt,
+    get_current_user_with_tenants_jwt,
+    get_current_token_claims,
     require_tenant,
     require_user_tenant,
     get_optional_tenant_user,
@@ -38,7 +40,6 @@ from app.api.deps.rbac import (
     _forbidden,
     _not_a_member,
     _resolve_effective_role,
-    _attach_tenants,
     _require_rank,
     _require_rank_or_api_key,
     require_write_access,
@@ -57,6 +58,7 @@ from app.api.deps.rbac import (
     require_active_subscription,
 )
 from app.api.deps.tokens import issue_tokens_for_user
+from app.api.deps.clock import get_request_now
 
 __all__ = [
     # db
@@ -70,6 +72,8 @@ __all__ = [
     "_user_from_middleware_jwt",
     "_principal_from_middleware_api_key",
     "get_current_user_jwt",
+    "get_current_user_with_tenants_jwt",
+    "get_current_token_claims",
     "require_tenant",
     "require_user_tenant",
     "get_optional_tenant_user",
@@ -85,7 +89,6 @@ __all__ = [
     "_forbidden",
     "_not_a_member",
     "_resolve_effective_role",
-    "_attach_tenants",
     "_require_rank",
     "_require_rank_or_api_key",
     "require_write_access",
@@ -104,4 +107,6 @@ __all__ = [
     "require_active_subscription",
     # tokens
     "issue_tokens_for_user",
+    # clock
+    "get_request_now",
 ]
@@ -1,10 +1,9 @@
-import uuid
-
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 
 from app.api.deps.db import get_db, get_active_user_by_id
+from app.core.auth_tokens import parse_claim_uuid
 from app.core.security import verify_token
 from app.core.request_auth import (
     AUTH_METHOD_API_KEY,
@@ -21,7 +20,7 @@ security_optional = HTTPBearer(auto_error=False)
 _DEACTIVATED_USER_DETAIL = "User not found or account has been deactivated"
 
 
-def _user_from_middleware_jwt(request: Request, db: Session) -> User:
+def _user_from_middleware_jwt(request: Request, db: Session, with_tenants: bool = False) -> User:
     # Inline the get_workspace dep to avoid importing workspace.py (would create a cycle)
     workspace = get_workspace_from_request(request)
     if workspace is None:
@@ -29,7 +28,9 @@ def _user_from_middleware_jwt(request: Request, db: Session) -> User:
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Workspace context not available",
         )
-    user = get_active_user_by_id(db, request.state.user_id)
+    user = get_active_user_by_id(
+        db, request.state.user_id, with_tenants=with_tenants, cached=True
+    )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -53,12 +54,13 @@ def _principal_from_middleware_api_key(request: Request) -> ApiKeyPrincipal:
     )
 
 
-def get_current_user_jwt(
+def _authenticate_jwt_user(
     request: Request,
-    credentials: HTTPAuthorizationCredentials | None = Depends(security_optional),
-    db: Session = Depends(get_db),
+    credentials: HTTPAuthorizationCredentials | None,
+    db: Session,
+    with_tenants: bool = False,
 ) -> User:
-    """JWT-based user authentication (middleware-validated or Bearer header)."""
+    """Resolve the JWT user (middleware-validated or Bearer header)."""
     method = get_auth_method(request)
     if method == AUTH_METHOD_API_KEY:
         raise HTTPException(
@@ -67,7 +69,7 @@ def get_current_user_jwt(
             headers={"WWW-Authenticate": "Bearer"},
         )
     if method == AUTH_METHOD_JWT:
-        return _user_from_middleware_jwt(request, db)
+        return _user_from_middleware_jwt(request, db, with_tenants=with_tenants)
 
     if not credentials:
         raise HTTPException(
@@ -93,7 +95,7 @@ def get_current_user_jwt(
         )
 
     try:
-        user_id = uuid.UUID(user_id_str)
+        user_id = parse_claim_uuid(user_id_str)
     except ValueError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -101,7 +103,7 @@ def get_current_user_jwt(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user = get_active_user_by_id(db, user_id)
+    user = get_active_user_by_id(db, user_id, with_tenants=with_tenants, cached=True)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -112,6 +114,54 @@ def get_current_user_jwt(
     return user
 
 
+def get_current_user_jwt(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials | None = Depends(security_optional),
+    db: Session = Depends(get_db),
+) -> User:
+    """JWT-based user authentication (middleware-validated or Bearer header)."""
+    return _authenticate_jwt_user(request, credentials, db)
+
+
+def get_current_user_with_tenants_jwt(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials | None = Depends(security_optional),
+    db: Session = Depends(get_db),
+) -> User:
+    """Same as ``get_current_user_jwt`` with ``user.tenants`` loaded in the user query."""
+    return _authenticate_jwt_user(request, credentials, db, with_tenants=True)
+
+
+async def get_current_token_claims(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials | None = Depends(security_optional),
+) -> dict:
+    """Validated JWT claims (signature + expiry) without a database lookup.
+
+    For endpoints that only need ``user_id``/``tenant_id``/``role`` from the
+    token. Use ``get_current_user_jwt`` whenever row-level user state
+    (soft-delete, profile fields, memberships) matters. Nothing here blocks,
+    so it is ``async def`` and runs on the event loop without a threadpool hop.
+    """
+    if get_auth_method(request) == AUTH_METHOD_API_KEY or not credentials:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    payload = verify_token(credentials.credentials)
+    try:
+        payload["user_id"] = parse_claim_uuid(payload["user_id"])
+    except (TypeError, KeyError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return payload
+
+
 def require_tenant(
     request: Request,
     credentials: HTTPAuthorizationCredentials | None = Depends(security_optional),
@@ -154,15 +204,15 @@ def require_tenant(
         )
 
     try:
-        user_id = uuid.UUID(user_id_str)
-        tenant_uuid = uuid.UUID(tenant_id)
+        user_id = parse_claim_uuid(user_id_str)
+        tenant_uuid = parse_claim_uuid(tenant_id)
     except ValueError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid tenant in token",
         )
 
-    user = get_active_user_by_id(db, user_id)
+    user = get_active_user_by_id(db, user_id, cached=True)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -187,7 +237,7 @@ def require_user_tenant(
 
 
 def get_optional_tenant_user(
-    credentials: HTTPAuthorizationCredentials | None = Depends(HTTPBearer(auto_error=False)),
+    credentials: HTTPAuthorizationCredentials | None = Depends(security_optional),
     db: Session = Depends(get_db),
 ) -> User | None:
     """Return the authenticated user, or None when auth is absent/invalid.
@@ -211,12 +261,12 @@ def get_optional_tenant_user(
             return None
 
         try:
-            user_id = uuid.UUID(user_id_str)
-            tenant_uuid = uuid.UUID(tenant_id)
+            user_id = parse_claim_uuid(user_id_str)
+            tenant_uuid = parse_claim_uuid(tenant_id)
         except ValueError:
             return None
 
-        user = get_active_user_by_id(db, user_id)
+        user = get_active_user_by_id(db, user_id, cached=True)
         if user:
             user.current_tenant_id = tenant_uuid
         return user
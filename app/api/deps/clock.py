@@ -0,0 +1,17 @@
+from datetime import datetime, timezone
+
+from fastapi import Request
+
+
+def get_request_now(request: Request) -> datetime:
+    """Return one timezone-aware UTC timestamp per request.
+
+    The first call stores it on ``request.state.now``; every later caller in
+    the same request (handlers, helpers, other dependencies) reuses it, so
+    expiry checks and the timestamps written for them always agree.
+    """
+    now = getattr(request.state, "now", None)
+    if now is None:
+        now = datetime.now(timezone.utc)
+        request.state.now = now
+    return now
@@ -2,11 +2,12 @@ from typing import Generator
 import uuid
 
 from sqlalchemy.exc import InterfaceError
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 
 from app.db.session import SessionLocal
 from app.db.async_session import get_db as get_async_db  # noqa: F401 — re-exported for callers
 from app.models.user import User
+from app.services import user_cache_service
 
 
 def get_db() -> Generator:
@@ -21,10 +22,26 @@ def get_db() -> Generator:
             pass
 
 
-def get_active_user_by_id(db: Session, user_id: uuid.UUID) -> User | None:
-    """Load a user only when not soft-deleted (``deleted_at IS NULL``)."""
-    return (
-        db.query(User)
-        .filter(User.id == user_id, User.deleted_at.is_(None))
-        .first()
-    )
+def get_active_user_by_id(
+    db: Session, user_id: uuid.UUID, with_tenants: bool = False, cached: bool = False
+) -> User | None:
+    """Load a user only when not soft-deleted (``deleted_at IS NULL``).
+
+    ``with_tenants`` joins ``User.tenants`` into the same SELECT, for callers
+    that read the collection (saves the separate lazy-load round-trip).
+    ``cached`` serves the row from ``user_cache_service`` when warm (used by
+    the per-request auth dependencies; ignored together with ``with_tenants``).
+    """
+    use_cache = cached and not with_tenants
+    if use_cache:
+        generation = user_cache_service.generation(user_id)
+        user = user_cache_service.get(db, user_id, generation)
+        if user is not None:
+            return user
+    query = db.query(User)
+    if with_tenants:
+        query = query.options(joinedload(User.tenants))
+    user = query.filter(User.id == user_id, User.deleted_at.is_(None)).first()
+    if use_cache and user is not None:
+        user_cache_service.store(user, generation)
+    return user
@@ -5,8 +5,7 @@ from sqlalchemy.orm import Session
 from app.api.deps.auth import require_user_tenant, require_tenant
 from app.api.deps.db import get_db
 from app.core.request_auth import ApiKeyPrincipal
-from app.models.user import User, user_tenant_association
-from app.models.tenant import Tenant
+from app.models.user import User
 from app.services import role_service, rbac_cache_service
 from app.services.role_service import get_user_role_in_tenant
 
@@ -56,17 +55,6 @@ def _resolve_effective_role(user: User, db: Session) -> str | None:
     return rbac_cache_service.get_effective_role(db, user.id, user.current_tenant_id)
 
 
-def _attach_tenants(user: User, db: Session) -> User:
-    if not hasattr(user, "tenants") or user.tenants is None:
-        user.tenants = (
-            db.query(Tenant)
-            .join(user_tenant_association)
-            .filter(user_tenant_association.c.user_id == user.id)
-            .all()
-        )
-    return user
-
-
 def require_write_access(
     request: Request,
     user: User = Depends(require_user_tenant),
@@ -82,7 +70,11 @@ def require_write_access(
 
 def _require_rank(required: str):
     """Build a dependency that passes when the caller's effective role outranks
-    ``required`` in the admin > manager > config_only > read_only chain."""
+    ``required`` in the admin > manager > config_only > read_only chain.
+
+    Membership and role come from one cached lookup; ``user.tenants`` is left
+    lazy so only handlers that actually read it pay for loading it.
+    """
 
     def _dependency(
         user: User = Depends(require_user_tenant),
@@ -93,7 +85,7 @@ def _require_rank(required: str):
             raise _not_a_member()
         if not role_service.has_rank(role_name, required):
             raise _forbidden(required, role_name)
-        return _attach_tenants(user, db)
+        return user
 
     _dependency.__name__ = f"require_{required}"
     return _dependency
@@ -2,7 +2,7 @@ import uuid
 
 from sqlalchemy.orm import Session
 
-from app.core.security import create_user_token, create_refresh_token_value, refresh_token_expires_at
+from app.core.security import create_user_token, create_refresh_token_value, hash_refresh_token, refresh_token_expires_at
 from app.models.refresh_token import RefreshToken
 from app.models.user import User
 from app.schemas.auth import TokenResponse, RoleInfo
@@ -19,17 +19,19 @@ def issue_tokens_for_user(
 
     Used for provider-based authentication flows (e.g. Google OAuth, SSO).
     """
+    user_id = user.id
+    email = user.email
     access_token = create_user_token(
-        user_id=user.id,
-        email=user.email,
+        user_id=user_id,
+        email=email,
         tenant_id=current_tenant_id,
         role=role_info.name if role_info else None,
     )
 
     rt_value = create_refresh_token_value()
     rt = RefreshToken(
-        user_id=user.id,
-        token=rt_value,
+        user_id=user_id,
+        token=hash_refresh_token(rt_value),
         expires_at=refresh_token_expires_at(),
         revoked=False,
     )
@@ -38,17 +40,16 @@ def issue_tokens_for_user(
 
     product_id = None
     if current_tenant_id:
-        product = get_user_product_in_tenant(db, user.id, current_tenant_id)
+        product = get_user_product_in_tenant(db, user_id, current_tenant_id)
         if product:
             product_id = product.id
 
-    return TokenResponse(
+    return TokenResponse.model_construct(
         access_token=access_token,
-        user_id=user.id,
-        email=user.email,
+        user_id=user_id,
+        email=email,
         tenant_id=current_tenant_id,
         product_id=product_id,
-        tenant_ids=[t.id for t in user.tenants],
         role=role_info,
         refresh_token=rt_value,
     )
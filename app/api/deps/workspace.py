@@ -13,13 +13,16 @@ from app.models.api_key import Apikey
 from app.models.tenant import Tenant
 from app.models.user import User
 
-_UNAUTHORIZED_WORKSPACE = HTTPException(
-    status_code=status.HTTP_401_UNAUTHORIZED,
-    detail={"code": "unauthorized", "message": "Invalid or missing API key"},
-)
+def _unauthorized_workspace() -> HTTPException:
+    # A fresh instance per raise: re-raising one shared exception keeps
+    # prepending to its __traceback__, pinning every failed request's frames.
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail={"code": "unauthorized", "message": "Invalid or missing API key"},
+    )
 
 
-def get_workspace(request: Request) -> Workspace:
+async def get_workspace(request: Request) -> Workspace:
     """Return the workspace (tenant) attached by auth middleware.
 
     Use in route handlers: ``workspace: Workspace = Depends(get_workspace)``
@@ -33,9 +36,9 @@ def get_workspace(request: Request) -> Workspace:
     return workspace
 
 
-def get_workspace_api_key(request: Request) -> Workspace:
+async def get_workspace_api_key(request: Request) -> Workspace:
     """Workspace context for machine-to-machine routes (API key only, no JWT)."""
-    workspace = get_workspace(request)
+    workspace = await get_workspace(request)
     if get_auth_method(request) != AUTH_METHOD_API_KEY:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -54,17 +57,17 @@ async def get_current_workspace(
     raw_key = (x_api_key or "").strip()
     workspace_header = (x_workspace_id or "").strip()
     if not raw_key or not workspace_header:
-        raise _UNAUTHORIZED_WORKSPACE
+        raise _unauthorized_workspace()
 
     try:
         workspace_id = uuid.UUID(workspace_header)
     except ValueError:
-        raise _UNAUTHORIZED_WORKSPACE
+        raise _unauthorized_workspace()
 
     existing = get_workspace_from_request(request)
     if existing is not None and existing.id == workspace_id:
         if not existing.is_active:
-            raise _UNAUTHORIZED_WORKSPACE
+            raise _unauthorized_workspace()
         return existing
 
     key_hash = hashlib.sha256(raw_key.encode()).hexdigest()
@@ -81,12 +84,12 @@ async def get_current_workspace(
     row = result.first()
 
     if row is None:
-        raise _UNAUTHORIZED_WORKSPACE
+        raise _unauthorized_workspace()
 
     api_key_obj, tenant = row
     workspace = Workspace.from_tenant(tenant)
     if not workspace.is_active:
-        raise _UNAUTHORIZED_WORKSPACE
+        raise _unauthorized_workspace()
 
     request.state.workspace = workspace
     request.state.workspace_id = workspace.id
@@ -96,7 +99,7 @@ async def get_current_workspace(
     return workspace
 
 
-def require_active_workspace(
+async def require_active_workspace(
     workspace: Workspace = Depends(get_workspace),
 ) -> Workspace:
     """Ensure the resolved workspace is active (middleware-attached snapshot)."""
@@ -2,10 +2,23 @@
 from __future__ import annotations
 
 import uuid
+from functools import lru_cache
 
 from app.core.security import verify_token
 
 
+@lru_cache(maxsize=8192)
+def parse_claim_uuid(value: str) -> uuid.UUID:
+    """
+    ``uuid.UUID(value)`` for a token claim, memoized.
+
+    The same user/tenant ids arrive on every request of a session, so each
+    distinct string is parsed once per process. Raises ``ValueError`` like
+    ``uuid.UUID``.
+    """
+    return uuid.UUID(value)
+
+
 def extract_bearer_token(authorization_header: str | None) -> str | None:
     if not authorization_header:
         return None
@@ -33,8 +46,8 @@ def resolve_jwt_auth(token: str) -> dict | None:
         return None
 
     try:
-        user_id = uuid.UUID(str(user_id_str))
-        workspace_id = uuid.UUID(str(tenant_id_str))
+        user_id = parse_claim_uuid(str(user_id_str))
+        workspace_id = parse_claim_uuid(str(tenant_id_str))
     except ValueError:
         return None
 
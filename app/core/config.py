@@ -17,6 +17,7 @@ assembled by a model_validator and exposed as grouped views:
 
 from __future__ import annotations
 
+from typing import Literal
 
 from pydantic import BaseModel, ConfigDict, Field, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -42,6 +43,10 @@ class DbSettings(BaseModel):
     max_overflow: int = Field(default=20, validation_alias="DATABASE_MAX_OVERFLOW")
     pool_timeout: int = Field(default=30, validation_alias="DATABASE_POOL_TIMEOUT")
     statement_timeout: int = Field(default=30000, validation_alias="DATABASE_STATEMENT_TIMEOUT")
+    pool_recycle: int = Field(default=1800, validation_alias="DATABASE_POOL_RECYCLE")
+    pgbouncer: bool = Field(default=False, validation_alias="DATABASE_PGBOUNCER")
+    query_cache_size: int = Field(default=1200, validation_alias="DATABASE_QUERY_CACHE_SIZE")
+    pool_warmup: int = Field(default=0, validation_alias="DATABASE_POOL_WARMUP")
 
 
 class AuthSettings(BaseModel):
@@ -51,6 +56,13 @@ class AuthSettings(BaseModel):
     algorithm: str = Field(default="", validation_alias="ALGORITHM")
     access_token_expire_minutes: int = Field(default=15, validation_alias="ACCESS_TOKEN_EXPIRE_MINUTES")
     refresh_token_expire_days: int = Field(default=7, validation_alias="REFRESH_TOKEN_EXPIRE_DAYS")
+    password_hash_scheme: Literal["argon2id", "bcrypt"] = Field(
+        default="argon2id", validation_alias="PASSWORD_HASH_SCHEME"
+    )
+    password_bcrypt_rounds: int = Field(default=12, validation_alias="PASSWORD_BCRYPT_ROUNDS")
+    password_argon2_memory_cost: int = Field(default=47104, validation_alias="PASSWORD_ARGON2_MEMORY_COST")
+    password_argon2_time_cost: int = Field(default=1, validation_alias="PASSWORD_ARGON2_TIME_COST")
+    password_argon2_parallelism: int = Field(default=1, validation_alias="PASSWORD_ARGON2_PARALLELISM")
     password_reset_token_expire_minutes: int = Field(
         default=30, validation_alias="PASSWORD_RESET_TOKEN_EXPIRE_MINUTES"
     )
@@ -305,11 +317,41 @@ class Settings(BaseSettings):
     DATABASE_MAX_OVERFLOW: int = 20
     DATABASE_POOL_TIMEOUT: int = 30       # seconds to wait for a connection from the pool
     DATABASE_STATEMENT_TIMEOUT: int = 30000  # milliseconds; auto-terminates slow queries in PG
+    DATABASE_POOL_RECYCLE: int = 1800     # seconds; replace pooled connections older than this
+    # DATABASE_URL points at PgBouncer in transaction-pooling mode: no startup
+    # options and no server-side prepared statements (set statement_timeout on
+    # the database role instead).
+    DATABASE_PGBOUNCER: bool = False
+    # Compiled-SQL cache entries per engine (SQLAlchemy default 500). Sized so
+    # the statements of every router stay cached instead of being evicted
+    # and recompiled under mixed traffic.
+    DATABASE_QUERY_CACHE_SIZE: int = 1200
+    # Sync-pool connections opened at startup so the first requests after a
+    # deploy don't pay TCP/TLS + auth handshakes. 0 disables; capped at
+    # DATABASE_POOL_SIZE.
+    DATABASE_POOL_WARMUP: int = 0
+    # Worker threads shared by sync (def) endpoints, sync dependencies and
+    # BackgroundTasks. Unset keeps AnyIO's default of 40; set it to raise
+    # concurrency, with the DB pool (DATABASE_POOL_SIZE + DATABASE_MAX_OVERFLOW)
+    # sized for the DB-bound share of those threads.
+    SYNC_THREADPOOL_SIZE: int | None = None
 
     SECRET_KEY: str = ""
     ALGORITHM: str = ""
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    # Scheme for new password hashes: "argon2id" (default) or "bcrypt". Hashes
+    # of either scheme keep verifying; with argon2id, bcrypt hashes are
+    # upgraded on the user's next successful login.
+    PASSWORD_HASH_SCHEME: Literal["argon2id", "bcrypt"] = "argon2id"
+    # bcrypt cost factor for new password hashes (each +1 doubles CPU per hash).
+    # Existing hashes keep verifying regardless of the rounds they were made with.
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+    # argon2id parameters (OWASP: 46 MiB, 1 pass, 1 lane). Memory is per hash,
+    # so peak use is memory_cost x password hashes running at the same time.
+    PASSWORD_ARGON2_MEMORY_COST: int = 47104
+    PASSWORD_ARGON2_TIME_COST: int = 1
+    PASSWORD_ARGON2_PARALLELISM: int = 1
 
     # Environment — controls which Twilio credentials are used and Secret Manager behaviour.
     # Values: "development" | "staging" | "production"
@@ -834,12 +876,21 @@ class Settings(BaseSettings):
             max_overflow=self.DATABASE_MAX_OVERFLOW,
             pool_timeout=self.DATABASE_POOL_TIMEOUT,
             statement_timeout=self.DATABASE_STATEMENT_TIMEOUT,
+            pool_recycle=self.DATABASE_POOL_RECYCLE,
+            pgbouncer=self.DATABASE_PGBOUNCER,
+            query_cache_size=self.DATABASE_QUERY_CACHE_SIZE,
+            pool_warmup=self.DATABASE_POOL_WARMUP,
         )
         self.auth = AuthSettings(
             secret_key=self.SECRET_KEY,
             algorithm=self.ALGORITHM,
             access_token_expire_minutes=self.ACCESS_TOKEN_EXPIRE_MINUTES,
             refresh_token_expire_days=self.REFRESH_TOKEN_EXPIRE_DAYS,
+            password_hash_scheme=self.PASSWORD_HASH_SCHEME,
+            password_bcrypt_rounds=self.PASSWORD_BCRYPT_ROUNDS,
+            password_argon2_memory_cost=self.PASSWORD_ARGON2_MEMORY_COST,
+            password_argon2_time_cost=self.PASSWORD_ARGON2_TIME_COST,
+            password_argon2_parallelism=self.PASSWORD_ARGON2_PARALLELISM,
             password_reset_token_expire_minutes=self.PASSWORD_RESET_TOKEN_EXPIRE_MINUTES,
             webhook_secret_encryption_key=self.WEBHOOK_SECRET_ENCRYPTION_KEY,
             sso_encryption_key=self.SSO_ENCRYPTION_KEY,
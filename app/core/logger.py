@@ -1,11 +1,29 @@
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
+import time
 from app.core.config import settings
 
 
 class _PiiRedactingFormatter(logging.Formatter):
     """Formatter that redacts PII inside exception tracebacks."""
 
+    # (epoch second, strftime text) of the last rendered %(asctime)s.
+    _second_cache: tuple[int | None, str] = (None, "")
+
+    def formatTime(self, record: logging.LogRecord, datefmt: str | None = None) -> str:
+        if datefmt is not None:
+            return super().formatTime(record, datefmt)
+        # Records arrive many per second; strftime once per second, not per record.
+        second = int(record.created)
+        cached = self._second_cache
+        if cached[0] != second:
+            cached = (second, time.strftime(self.default_time_format, self.converter(second)))
+            self._second_cache = cached
+        return self.default_msec_format % (cached[1], record.msecs)
+
     def formatException(self, ei) -> str:
         from app.core.pii_redactor import redact_pii
 
@@ -58,6 +76,25 @@ def _attach_pii_filter(target: logging.Logger, pii_filter: _PiiRedactionFilter)
             handler.addFilter(pii_filter)
 
 
+def _start_queue_logging(*handlers: logging.Handler) -> logging.Handler:
+    """Route records to ``handlers`` through a background listener thread.
+
+    Request threads only enqueue; the stdout write happens on the listener.
+    The returned QueueHandler renders the message (and the PII-redacted
+    traceback) in the caller's thread, since the listener sees only the
+    pre-formatted record.
+    """
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(_PiiRedactingFormatter("%(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    # Drain what is still queued when the process exits.
+    atexit.register(listener.stop)
+    queue_handler.listener = listener  # same attribute dictConfig sets on 3.12+
+    return queue_handler
+
+
 def setup_logging() -> logging.Logger:
     log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 
@@ -71,7 +108,7 @@ def setup_logging() -> logging.Logger:
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(log_level)
         console_handler.setFormatter(_PiiRedactingFormatter(log_format))
-        root_logger.addHandler(console_handler)
+        root_logger.addHandler(_start_queue_logging(console_handler))
 
     _attach_pii_filter(root_logger, pii_filter)
 
@@ -1,67 +1,161 @@
 from datetime import datetime, timedelta, timezone
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from jose import JWTError, jwk, jwt
 from app.core.config import settings
-import uuid
+from calendar import timegm
+from collections import OrderedDict
+from functools import lru_cache
+import base64
+import hashlib
+import hmac
+import json
+import os
 import secrets
+import threading
+import time
+import bcrypt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+import uuid
+
+_HMAC_DIGESTS = {"HS256": hashlib.sha256, "HS384": hashlib.sha384, "HS512": hashlib.sha512}
+
+def _b64url(raw: bytes) -> bytes:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=")
+
+@lru_cache(maxsize=4)
+def _hmac_signer(secret: str, algorithm: str) -> tuple[bytes, "hmac.HMAC"] | None:
+    """
+    Encoded header segment and keyed HMAC for an HS* algorithm, built once.
+
+    Returns None for non-HMAC algorithms, which keep going through jose.
+    """
+    digest = _HMAC_DIGESTS.get(algorithm)
+    if digest is None or not secret:
+        return None
+    # Same header bytes jose produces (sorted keys, compact separators)
+    header = json.dumps({"alg": algorithm, "typ": "JWT"}, separators=(",", ":"), sort_keys=True)
+    return _b64url(header.encode("utf-8")) + b".", hmac.new(secret.encode("utf-8"), digestmod=digest)
+
+@lru_cache(maxsize=4)
+def _verification_key(secret: str, algorithm: str):
+    """
+    Secret as a ready jose key for HS* algorithms, built once.
+
+    Handing jose a Key object skips its per-decode key parsing (JSON probe,
+    PEM/SSH checks); other algorithms get the raw secret as before.
+    """
+    if algorithm not in _HMAC_DIGESTS or not secret:
+        return secret
+    return jwk.construct(secret, algorithm)
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+def _encode_hmac_jwt(claims: dict, header_segment: bytes, keyed_hmac: "hmac.HMAC") -> str:
+    """Byte-for-byte equivalent of ``jose.jwt.encode`` for HS* algorithms."""
+    for time_claim in ("exp", "iat", "nbf"):
+        value = claims.get(time_claim)
+        if isinstance(value, datetime):
+            claims[time_claim] = timegm(value.utctimetuple())
+    payload = json.dumps(claims, separators=(",", ":")).encode("utf-8")
+    signing_input = header_segment + _b64url(payload)
+    mac = keyed_hmac.copy()
+    mac.update(signing_input)
+    return (signing_input + b"." + _b64url(mac.digest())).decode("ascii")
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
     """Create JWT access token with expiration"""
-    to_encode = data.copy()
     if expires_delta:
         expire = datetime.now(timezone.utc) + expires_delta
     else:
         # Use the configured expiration time (15 minutes by default)
         expire = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
-    return encoded_jwt
+    # exp goes in as the integer NumericDate jose would produce, built in the
+    # same dict as the caller's claims (which are never mutated).
+    to_encode = {**data, "exp": timegm(expire.utctimetuple())}
+    signer = _hmac_signer(settings.SECRET_KEY, settings.ALGORITHM)
+    if signer is None:
+        return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    return _encode_hmac_jwt(to_encode, *signer)
+
+# Verified payloads are remembered until the token's own exp, so polling
+# endpoints and repeated auth checks of the same token skip the HMAC + JSON
+# decode. Only tokens that passed verification are cached, keyed by a digest
+# so the bearer strings themselves are not held in memory.
+_VERIFIED_TOKEN_CACHE_MAXSIZE = 4096
+_verified_token_cache: "OrderedDict[tuple, tuple[dict, float]]" = OrderedDict()
+_verified_token_cache_lock = threading.Lock()
+
+def _decode_token(token: str) -> dict:
+    """``jwt.decode`` with the configured key, served from cache while unexpired.
+
+    Raises ``JWTError`` like ``jwt.decode``; returns a copy callers may mutate.
+    """
+    key = (hashlib.sha256(token.encode()).digest(), settings.SECRET_KEY, settings.ALGORITHM)
+    now = time.time()
+    with _verified_token_cache_lock:
+        cached = _verified_token_cache.get(key)
+        if cached is not None:
+            if cached[1] > now:
+                _verified_token_cache.move_to_end(key)
+                return dict(cached[0])
+            del _verified_token_cache[key]
+
+    payload = jwt.decode(
+        token,
+        _verification_key(settings.SECRET_KEY, settings.ALGORITHM),
+        algorithms=[settings.ALGORITHM],
+    )
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        with _verified_token_cache_lock:
+            _verified_token_cache[key] = (dict(payload), float(exp))
+            if len(_verified_token_cache) > _VERIFIED_TOKEN_CACHE_MAXSIZE:
+                _verified_token_cache.popitem(last=False)
+    return payload
 
 def verify_token(token: str) -> dict | None:
     """Verify and decode JWT token"""
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
+        return _decode_token(token)
     except JWTError:
         return None
 
-def is_token_expired(token: str) -> bool:
-    """Check if token is expired"""
-    payload = verify_token(token)
+def payload_expired(payload: dict | None) -> bool:
+    """True when a decoded token payload is missing or past its ``exp``.
+
+    Takes the payload callers already hold, so checking expiry never costs a
+    second decode.
+    """
     if not payload:
         return True
-    
     exp_timestamp = payload.get("exp")
     if not exp_timestamp:
         return True
-    
-    exp_time = datetime.fromtimestamp(exp_timestamp, tz=timezone.utc)
-    return datetime.now(timezone.utc) > exp_time
+    return time.time() > exp_timestamp
+
+def is_token_expired(token: str) -> bool:
+    """Check if token is expired"""
+    return payload_expired(verify_token(token))
 
 def get_token_info(token: str) -> dict | None:
     """Get comprehensive token information"""
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = _decode_token(token)
         exp_timestamp = payload.get("exp")
         iat_timestamp = payload.get("iat")
+        exp_time = datetime.fromtimestamp(exp_timestamp, tz=timezone.utc) if exp_timestamp else None
         
         token_info = {
             "user_id": payload.get("user_id"),
             "email": payload.get("email"),
             "tenant_id": payload.get("tenant_id"),
             "type": payload.get("type"),
-            "expires_at": datetime.fromtimestamp(exp_timestamp, tz=timezone.utc).isoformat() if exp_timestamp else None,
+            "expires_at": exp_time.isoformat() if exp_time else None,
             "issued_at": datetime.fromtimestamp(iat_timestamp, tz=timezone.utc).isoformat() if iat_timestamp else None,
             "is_expired": False,
             "expires_in_minutes": None
         }
         
-        if exp_timestamp:
-            exp_time = datetime.fromtimestamp(exp_timestamp, tz=timezone.utc)
+        if exp_time:
             now = datetime.now(timezone.utc)
             token_info["is_expired"] = now > exp_time
             if not token_info["is_expired"]:
@@ -72,18 +166,69 @@ def get_token_info(token: str) -> dict | None:
     except JWTError:
         return None
 
+@lru_cache(maxsize=4)
+def _argon2_hasher(memory_cost: int, time_cost: int, parallelism: int) -> PasswordHasher:
+    return PasswordHasher(time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism)
+
+def _configured_argon2() -> PasswordHasher:
+    return _argon2_hasher(
+        settings.PASSWORD_ARGON2_MEMORY_COST,
+        settings.PASSWORD_ARGON2_TIME_COST,
+        settings.PASSWORD_ARGON2_PARALLELISM,
+    )
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify password against hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    """Verify password against an argon2id or bcrypt hash"""
+    if hashed_password.startswith("$argon2"):
+        try:
+            return _configured_argon2().verify(hashed_password, plain_password)
+        except (VerificationError, InvalidHashError):
+            return False
+    try:
+        return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
+    except ValueError:
+        # Empty or unknown hash (e.g. provider-only accounts) never matches
+        return False
+
+def get_password_hash(password: str, rounds: int | None = None) -> str:
+    """Hash password with the configured scheme.
+
+    ``rounds`` forces bcrypt at that cost factor (for throwaway hashes that
+    must be cheap, e.g. SSO placeholder passwords).
+    """
+    if rounds is None and settings.PASSWORD_HASH_SCHEME == "argon2id":
+        return _configured_argon2().hash(password)
+    salt = bcrypt.gensalt(rounds=rounds or settings.PASSWORD_BCRYPT_ROUNDS)
+    return bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True when a verified hash should be replaced by one from get_password_hash.
+
+    Only upgrades towards argon2id: bcrypt hashes, or argon2 hashes made with
+    other parameters. Empty hashes (provider-only accounts) are left alone.
+    """
+    if settings.PASSWORD_HASH_SCHEME != "argon2id" or not hashed_password:
+        return False
+    if not hashed_password.startswith("$argon2"):
+        return True
+    return _configured_argon2().check_needs_rehash(hashed_password)
+
+@lru_cache(maxsize=1)
+def _dummy_password_hash() -> str:
+    return get_password_hash(os.urandom(16).hex())
 
-def get_password_hash(password: str) -> str:
-    """Hash password"""
-    return pwd_context.hash(password)
+def verify_dummy_password(plain_password: str) -> None:
+    """Spend one password check at the configured cost when there is no hash to
+    check against (unknown email), so that path costs the same as a real one."""
+    verify_password(plain_password, _dummy_password_hash())
 
 def create_user_token(user_id: uuid.UUID, email: str, tenant_id: uuid.UUID | None = None, role: str | None = None):
     """
     Create JWT token for user with 15-minute expiration
-    
+
+    Every call signs a new token; only the HMAC key material is cached
+    (``_hmac_signer``), so separate logins never share one token.
+
     Args:
         user_id: User's ID (UUID)
         email: User's email
@@ -129,9 +274,23 @@ def create_password_reset_token(user_id: uuid.UUID) -> tuple[str, datetime]:
     expires_at = datetime.now(timezone.utc) + timedelta(minutes=settings.PASSWORD_RESET_TOKEN_EXPIRE_MINUTES)
     return token, expires_at
 
+def _sha256_hex(value: str) -> str:
+    """SHA-256 hex digest of a random token, as persisted in token columns.
+
+    Reset and refresh tokens are 256 random bits, so no salt or slow hash is
+    needed; only the digest is stored and the raw value is sent out once.
+    """
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+# Stored in (and looked up by) ``PasswordResetToken.token``.
+hash_password_reset_token = _sha256_hex
+
 def create_refresh_token_value() -> str:
-    """Create secure random refresh token string."""
-    return secrets.token_urlsafe(48)
+    """Create secure random refresh token string (256 bits, 43 characters)."""
+    return secrets.token_urlsafe(32)
+
+# Stored in (and looked up by) ``RefreshToken.token``.
+hash_refresh_token = _sha256_hex
 
 def refresh_token_expires_at() -> datetime:
     """Get refresh token expiration time (7 days from now)."""
@@ -21,18 +21,28 @@ def init_async_db() -> None:
         if _async_engine is not None:
             return
 
+        if settings.DATABASE_PGBOUNCER:
+            # Transaction pooling hands each transaction a different backend, so
+            # asyncpg's named prepared statements must be disabled.
+            connect_args = {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+        else:
+            # asyncpg passes PG session parameters via server_settings, not libpq -c flags
+            connect_args = {
+                "server_settings": {
+                    "statement_timeout": str(settings.DATABASE_STATEMENT_TIMEOUT)
+                }
+            }
+
         _async_engine = create_async_engine(
             database_url_to_async(settings.DATABASE_URL),
             pool_pre_ping=True,
             pool_size=settings.DATABASE_POOL_SIZE,
             max_overflow=settings.DATABASE_MAX_OVERFLOW,
             pool_timeout=settings.DATABASE_POOL_TIMEOUT,
-            # asyncpg passes PG session parameters via server_settings, not libpq -c flags
-            connect_args={
-                "server_settings": {
-                    "statement_timeout": str(settings.DATABASE_STATEMENT_TIMEOUT)
-                }
-            },
+            pool_recycle=settings.DATABASE_POOL_RECYCLE,
+            pool_use_lifo=True,
+            query_cache_size=settings.DATABASE_QUERY_CACHE_SIZE,
+            connect_args=connect_args,
         )
         _AsyncSessionLocal = async_sessionmaker(
             _async_engine, class_=AsyncSession, expire_on_commit=False
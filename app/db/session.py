@@ -1,13 +1,54 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
+# PgBouncer (transaction pooling) rejects the libpq "options" startup
+# parameter, so statement_timeout has to come from the database role there.
+if settings.DATABASE_PGBOUNCER:
+    _connect_args = {}
+else:
+    _connect_args = {"options": f"-c statement_timeout={settings.DATABASE_STATEMENT_TIMEOUT}"}
+
+# psycopg2 already sends multi-row INSERTs as batched VALUES (SQLAlchemy's
+# default "values_only"); also batch executemany UPDATE/DELETE, which is
+# what a flush of many dirty rows emits. Other drivers don't take the option.
+_engine_kwargs = {}
+if make_url(settings.DATABASE_URL).get_driver_name() == "psycopg2":
+    _engine_kwargs["executemany_mode"] = "values_plus_batch"
+    # libpq TCP keepalives: a connection the server or a NAT/proxy dropped
+    # while idle is noticed by the kernel instead of by the next query.
+    _connect_args.update(keepalives=1, keepalives_idle=30, keepalives_interval=10, keepalives_count=3)
+
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,
     pool_size=settings.DATABASE_POOL_SIZE,
     max_overflow=settings.DATABASE_MAX_OVERFLOW,
     pool_timeout=settings.DATABASE_POOL_TIMEOUT,
-    connect_args={"options": f"-c statement_timeout={settings.DATABASE_STATEMENT_TIMEOUT}"},
+    pool_recycle=settings.DATABASE_POOL_RECYCLE,
+    # Reuse the most recently returned connection: the busy few stay warm and
+    # surplus ones sit idle long enough to be recycled rather than pinged.
+    pool_use_lifo=True,
+    query_cache_size=settings.DATABASE_QUERY_CACHE_SIZE,
+    connect_args=_connect_args,
+    **_engine_kwargs,
 )
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
\ No newline at end of file
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def warm_pool(size: int) -> int:
+    """Open up to ``size`` pooled connections now and hand them back.
+
+    Connections are checked out together so the pool really grows to that
+    many instead of reusing one. Returns how many were opened.
+    """
+    size = min(size, settings.DATABASE_POOL_SIZE)
+    connections = []
+    try:
+        for _ in range(size):
+            connections.append(engine.connect())
+    finally:
+        for conn in connections:
+            conn.close()
+    return len(connections)
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from contextlib import asynccontextmanager
 
+import anyio.to_thread
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
@@ -57,6 +58,20 @@ def create_app() -> FastAPI:
         except Exception as exc:
             logger.critical("Failed to initialize async DB pool: %s", exc, exc_info=True)
             raise
+
+        # Sync endpoints, dependencies and BackgroundTasks share AnyIO's
+        # worker threads; resize that limiter only when the operator asks to.
+        if settings.SYNC_THREADPOOL_SIZE is not None:
+            anyio.to_thread.current_default_thread_limiter().total_tokens = settings.SYNC_THREADPOOL_SIZE
+
+        if settings.DATABASE_POOL_WARMUP > 0:
+            from app.db.session import warm_pool
+
+            try:
+                opened = await anyio.to_thread.run_sync(warm_pool, settings.DATABASE_POOL_WARMUP)
+                logger.info("Sync DB pool warmed with %d connections", opened)
+            except Exception as exc:
+                logger.warning("Sync DB pool warmup failed: %s — connecting lazily", exc)
         try:
             await init_rate_limiter()
             logger.info("Rate limiter initialized successfully")
@@ -109,8 +109,22 @@ class Agent(Base):
     transfer_route = relationship("TransferRoute", back_populates="agents")
     callback_schedules = relationship("CallbackSchedule", back_populates="agent")
 
+    # Fetch server-generated columns (created_at, updated_at, server defaults)
+    # with RETURNING on the INSERT/UPDATE itself, so agent_service can build
+    # the response from the flushed row without a follow-up SELECT.
+    __mapper_args__ = {"eager_defaults": True}
+
     __table_args__ = (
         Index("ix_agent_tenant_id", "tenant_id"),
+        # Workspace agent listing: WHERE tenant_id = ? AND NOT is_deleted
+        # ORDER BY created_at DESC LIMIT n reads straight off this index.
+        Index(
+            "ix_agent_active_tenant_id_created_at",
+            "tenant_id",
+            "created_at",
+            postgresql_where=text("is_deleted = false"),
+            sqlite_where=text("is_deleted = 0"),
+        ),
         Index(
             "uq_agent_single_follow_up_per_tenant",
             "tenant_id",
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Index
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -26,4 +26,12 @@ class Invite(Base):
 
     __table_args__ = (
         Index("ix_invite_email_tenant_id", "email", "tenant_id"),
+        # Pending-invite lookups only; accepted/expired history stays out of it.
+        Index(
+            "ix_invite_pending_email_tenant_id",
+            "email",
+            "tenant_id",
+            postgresql_where=text("status IN ('pending', 'PENDING')"),
+            sqlite_where=text("status IN ('pending', 'PENDING')"),
+        ),
     )
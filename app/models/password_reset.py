@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -14,4 +14,15 @@ class PasswordResetToken(Base):
     used = Column(Boolean, default=False, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
-    user = relationship("User", back_populates="password_reset_tokens")
\ No newline at end of file
+    user = relationship("User", back_populates="password_reset_tokens")
+
+    __table_args__ = (
+        # forgot_password retires a user's outstanding tokens in one UPDATE;
+        # only unused rows are ever targeted, so spent history stays out of it.
+        Index(
+            "ix_passwordresettoken_unused_user_id",
+            "user_id",
+            postgresql_where=text("used = false"),
+            sqlite_where=text("used = 0"),
+        ),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Table, ForeignKey, DateTime, Boolean, JSON, Index, text
+from sqlalchemy import Column, String, Table, ForeignKey, DateTime, Boolean, JSON, Index, UniqueConstraint, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -12,6 +12,9 @@ user_tenant_association = Table(
     Column('is_creator', Boolean, nullable=False, default=False),
     Column('role_id', UUID(as_uuid=True), ForeignKey('role.id'), nullable=True),
     Column('product_id', UUID(as_uuid=True), ForeignKey('product.id'), nullable=True),
+    # Created by migration 9f3a2c7e5d41; declared here so membership probes on
+    # (user_id, tenant_id) are index lookups in every schema built from the models.
+    UniqueConstraint('user_id', 'tenant_id', name='uq_user_tenant_association_user_tenant'),
 )
 
 class User(Base):
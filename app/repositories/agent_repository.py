@@ -17,10 +17,10 @@ class AgentRepository:
         self.db = db
 
     def create(self, data: dict[str, Any]) -> Agent:
+        """Insert the agent and flush it (not committed)."""
         agent = Agent(**data)
         self.db.add(agent)
-        self.db.commit()
-        self.db.refresh(agent)
+        self.db.flush()
         return agent
 
     def find_by_id(
@@ -30,12 +30,13 @@ class AgentRepository:
         include_deleted: bool = False,
         load_transfer_route: bool = False,
     ) -> Agent | None:
-        stmt = select(Agent).where(Agent.id == agent_id)
-        if not include_deleted:
-            stmt = stmt.where(Agent.is_deleted == False)  # noqa: E712
-        if load_transfer_route:
-            stmt = stmt.options(joinedload(Agent.transfer_route))
-        return self.db.execute(stmt).scalar_one_or_none()
+        # Session.get answers from the identity map when the row is already
+        # loaded in this session and otherwise issues a plain PK SELECT.
+        options = [joinedload(Agent.transfer_route)] if load_transfer_route else None
+        agent = self.db.get(Agent, agent_id, options=options)
+        if agent is None or (agent.is_deleted and not include_deleted):
+            return None
+        return agent
 
     def find_by_workspace(
         self,
@@ -46,13 +47,7 @@ class AgentRepository:
         search: str | None = None,
     ) -> tuple[list[Agent], int]:
         offset = (page - 1) * limit
-        filters = [
-            Agent.tenant_id == workspace_id,
-            Agent.is_deleted == False,  # noqa: E712
-        ]
-        if search and search.strip():
-            term = search.strip().lower()
-            filters.append(func.lower(Agent.name).like(f"%{term}%"))
+        filters = self._workspace_filters(workspace_id, search)
 
         total = int(
             self.db.execute(select(func.count(Agent.id)).where(*filters)).scalar_one()
@@ -70,6 +65,22 @@ class AgentRepository:
         )
         return list(rows), total
 
+    def search_by_name(self, workspace_id: uuid.UUID, search: str) -> list[Agent]:
+        """Every active agent in the workspace whose name contains ``search``."""
+        stmt = select(Agent).where(*self._workspace_filters(workspace_id, search))
+        return list(self.db.execute(stmt).scalars().all())
+
+    @staticmethod
+    def _workspace_filters(workspace_id: uuid.UUID, search: str | None) -> list:
+        filters = [
+            Agent.tenant_id == workspace_id,
+            Agent.is_deleted == False,  # noqa: E712
+        ]
+        if search and search.strip():
+            term = search.strip().lower()
+            filters.append(func.lower(Agent.name).like(f"%{term}%"))
+        return filters
+
     def count_active_by_workspace(self, workspace_id: uuid.UUID) -> int:
         stmt = select(func.count(Agent.id)).where(
             Agent.tenant_id == workspace_id,
@@ -89,10 +100,10 @@ class AgentRepository:
         return self.db.execute(stmt).scalar_one_or_none()
 
     def update(self, agent: Agent, fields: dict[str, Any]) -> Agent:
+        """Apply ``fields`` to the agent and flush it (not committed)."""
         for key, value in fields.items():
             setattr(agent, key, value)
-        self.db.commit()
-        self.db.refresh(agent)
+        self.db.flush()
         return agent
 
     def soft_delete(self, agent: Agent, *, updated_by: uuid.UUID | None = None) -> None:
@@ -7,17 +7,26 @@ from __future__ import annotations
 import re
 import uuid
 from datetime import datetime, timezone
+from functools import lru_cache
 
 from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 
 from app.models.tenant import Tenant
 
+# Runs of anything that isn't a lowercase letter or digit (underscores included),
+# so replacing and collapsing happen in a single pass.
+_NON_ALNUM_RUN = re.compile(r"[^a-z0-9]+")
 
+@lru_cache(maxsize=1024)
 def _slugify(name: str) -> str:
-    slug = re.sub(r"[^a-zA-Z0-9]", "_", name.lower())
-    slug = re.sub(r"_+", "_", slug).strip("_")
-    return slug
+    return _NON_ALNUM_RUN.sub("_", name.lower()).strip("_")
+
+
+def generate_schema_name(tenant_name: str) -> str:
+    """Schema name derived from a tenant name (``"Acme Corp"`` -> ``"acme_corp_schema"``)."""
+    return f"{_slugify(tenant_name)}_schema"
 
 
 class WorkspaceRepository:
@@ -44,14 +53,34 @@ class WorkspaceRepository:
 
     # ----------------------------------------------------------------- writes
 
+    def insert(self, name: str, *, status: str, credits: int) -> Tenant:
+        """Insert a tenant with a free schema_name (not committed).
+
+        INSERT ... ON CONFLICT (schema_name) DO NOTHING RETURNING makes the
+        common case a single round-trip; on a collision the next candidate of
+        the usual sequence (``acme_schema``, ``acme_1_schema``, ``acme_2_schema``
+        ...) is tried. A duplicate active name is not covered by the conflict
+        target and raises ``IntegrityError`` (uq_tenant_name_active).
+        """
+        insert = postgresql.insert if self.db.get_bind().dialect.name == "postgresql" else sqlite.insert
+        base = _slugify(name) or f"ws_{uuid.uuid4().hex[:8]}"
+        schema_name = f"{base}_schema"
+        counter = 1
+        while True:
+            stmt = (
+                insert(Tenant)
+                .values(name=name, schema_name=schema_name, status=status, credits=credits)
+                .on_conflict_do_nothing(index_elements=["schema_name"])
+                .returning(Tenant)
+            )
+            tenant = self.db.scalars(stmt).first()
+            if tenant is not None:
+                return tenant
+            schema_name = f"{base}_{counter}_schema"
+            counter += 1
+
     def create(self, name: str) -> Tenant:
-        tenant = Tenant(
-            name=name,
-            schema_name=self._next_schema_name(name),
-            status="active",
-            credits=0,
-        )
-        self.db.add(tenant)
+        tenant = self.insert(name, status="active", credits=0)
         self.db.commit()
         self.db.refresh(tenant)
         return tenant
@@ -65,18 +94,3 @@ class WorkspaceRepository:
     def soft_delete(self, tenant: Tenant) -> None:
         tenant.deleted_at = datetime.now(timezone.utc)
         self.db.commit()
-
-    # ---------------------------------------------------------------- helpers
-
-    def _next_schema_name(self, name: str) -> str:
-        base = _slugify(name) or f"ws_{uuid.uuid4().hex[:8]}"
-        candidate = f"{base}_schema"
-        counter = 1
-        while self._schema_taken(candidate):
-            candidate = f"{base}_{counter}_schema"
-            counter += 1
-        return candidate
-
-    def _schema_taken(self, schema_name: str) -> bool:
-        stmt = select(Tenant.id).where(Tenant.schema_name == schema_name)
-        return self.db.execute(stmt).first() is not None
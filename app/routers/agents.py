@@ -114,7 +114,7 @@ def create_agent(
                 extras={"allowedValues": agent_service.list_active_llm_model_names(db)},
             )
         raise
-    return agent_to_out(agent)
+    return agent
 
 
 @router.get(
@@ -188,7 +188,7 @@ def update_agent(
                 extras={"fields": [{"path": "elevenLabsApiKey", "message": str(exc.detail)}]},
             )
         raise
-    return agent_to_out(agent)
+    return agent
 
 
 @router.delete("/{agent_id}", status_code=status.HTTP_204_NO_CONTENT, response_class=Response)
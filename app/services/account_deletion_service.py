@@ -20,6 +20,7 @@ from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from app.core.logger import logger
+from app.services import user_cache_service
 
 _ANON_EMAIL = "[DELETED@DELETED.COM]"
 _ANON_NAME = "[DELETED]"
@@ -70,7 +71,7 @@ def delete_workspace_account(db: Session, workspace_id: uuid.UUID) -> None:
             params,
         )
 
-        db.execute(
+        erased_user_ids = db.execute(
             text(
                 """
                 UPDATE "user"
@@ -80,10 +81,11 @@ def delete_workspace_account(db: Session, workspace_id: uuid.UUID) -> None:
                     phone = NULL,
                     deleted_at = now()
                 WHERE id IN (SELECT user_id FROM _gdpr_sole_tenant_users)
+                RETURNING id
                 """
             ),
             {**params, "anon_email": _ANON_EMAIL, "anon_name": _ANON_NAME},
-        )
+        ).scalars().all()
 
         # Multi-tenant users keep their identity; only their membership in
         # *this* workspace is removed.
@@ -129,6 +131,10 @@ def delete_workspace_account(db: Session, workspace_id: uuid.UUID) -> None:
         db.rollback()
         raise
 
+    # Soft-deleted users must stop authenticating on this worker right away.
+    for user_id in erased_user_ids:
+        user_cache_service.invalidate(uuid.UUID(str(user_id)))
+
     try:
         from app.services.s3_recording_service import delete_workspace_recordings
 
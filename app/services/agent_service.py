@@ -1,6 +1,6 @@
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import func, select
+from sqlalchemy import select
 from typing import List, Dict, Any
 from app.models.agent import Agent
 from app.models.phone_number import PhoneNumber
@@ -16,6 +16,7 @@ from app.schemas.agent import (
     AgentCreate,
     AgentUpdate,
     AgentListResponse,
+    AgentOut,
     TtsModelSchema,
     TtsProviderEnum,
     SttModelSchema,
@@ -404,7 +405,7 @@ class AgentService:
                 detail="transfer_route_id not found or does not belong to this tenant.",
             )
 
-    def _auto_ingest_agent_system_prompt(self, db: Session, agent: Agent) -> None:
+    def _auto_ingest_agent_system_prompt(self, db: Session, agent: Agent | AgentOut) -> None:
         """
         Automatically ingest agent system_prompt into RAG (best-effort).
         This keeps KB setup zero-touch for users who only configure an agent prompt.
@@ -470,7 +471,7 @@ class AgentService:
         agent_in: AgentCreate,
         tenant_id: uuid.UUID,
         user_id: uuid.UUID | None = None,
-    ) -> Agent:
+    ) -> AgentOut:
         """
         Create a new agent with tenant context and audit trail.
         Supports JWT users and API-key M2M (``user_id`` may be None).
@@ -536,16 +537,26 @@ class AgentService:
                 status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
                 detail="Agent role constraint violated (inbound or follow-up uniqueness per tenant).",
             )
-        self._auto_ingest_agent_system_prompt(db, db_agent)
+        # Build the response from the flushed row; the commit expires it.
+        agent_out = agent_to_out(db_agent)
+        db.commit()
+        self._auto_ingest_agent_system_prompt(db, agent_out)
 
-        return db_agent
+        return agent_out
     
-    def get_agent_by_id(self, db: Session, agent_id: uuid.UUID, tenant_id: uuid.UUID) -> Agent:
+    def get_agent_by_id(
+        self,
+        db: Session,
+        agent_id: uuid.UUID,
+        tenant_id: uuid.UUID,
+        *,
+        load_transfer_route: bool = True,
+    ) -> Agent:
         """
         Get agent by ID with strict tenant isolation.
         Returns 404 if agent doesn't exist or belongs to a different workspace.
         """
-        agent = self._repo(db).find_by_id(agent_id, load_transfer_route=True)
+        agent = self._repo(db).find_by_id(agent_id, load_transfer_route=load_transfer_route)
 
         if not agent:
             raise HTTPException(
@@ -591,11 +602,11 @@ class AgentService:
         agent_update: AgentUpdate, 
         tenant_id: uuid.UUID,
         user_id: uuid.UUID | None = None,
-    ) -> Agent:
+    ) -> AgentOut:
         """
         Update agent with tenant isolation and audit trail
         """
-        agent = self.get_agent_by_id(db, agent_id, tenant_id)
+        agent = self.get_agent_by_id(db, agent_id, tenant_id, load_transfer_route=False)
 
         update_dict = agent_update.model_dump(
             exclude_unset=True,
@@ -662,8 +673,11 @@ class AgentService:
                 status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
                 detail="Agent role constraint violated (inbound or follow-up uniqueness per tenant).",
             )
-        self._auto_ingest_agent_system_prompt(db, agent)
-        return agent
+        # Build the response from the flushed row; the commit expires it.
+        agent_out = agent_to_out(agent)
+        db.commit()
+        self._auto_ingest_agent_system_prompt(db, agent_out)
+        return agent_out
 
     def get_inbound_agent_knowledge_snapshot(
         self, db: Session, inbound_agent_id: uuid.UUID, tenant_id: uuid.UUID
@@ -785,7 +799,7 @@ No active tenant knowledge base documents were found.
         user_id: uuid.UUID | None = None,
     ) -> None:
         """Soft delete; raises 409 when an active phone number is still bound."""
-        agent = self.get_agent_by_id(db, agent_id, tenant_id)
+        agent = self.get_agent_by_id(db, agent_id, tenant_id, load_transfer_route=False)
 
         if self.has_active_phone_binding(db, agent.id):
             raise HTTPException(
@@ -845,13 +859,7 @@ No active tenant knowledge base documents were found.
         """
         if not search_term or not search_term.strip():
             return []
-        
-        clean_search_term = search_term.strip().lower()
-        return db.query(Agent).filter(
-            Agent.tenant_id == tenant_id,
-            ~Agent.is_deleted,
-            func.lower(Agent.name).like(f"%{clean_search_term}%")
-        ).all()
+        return self._repo(db).search_by_name(tenant_id, search_term)
     
     def get_agent_effective_model_config(self, db: Session, agent_id: uuid.UUID, tenant_id: uuid.UUID) -> Dict[str, Any]:
         """
@@ -0,0 +1,94 @@
+"""Redis-backed cache for the role catalogue (GET /roles/ and GET /roles/{id}).
+
+Roles are a tiny, rarely-edited global table read on every admin roles
+screen. Responses are cached as JSON for TTL_SECONDS under keys that embed a
+generation counter (roles:gen); role create/update/delete bumps the counter,
+which invalidates every cached page and role at once across all workers.
+
+``invalidate()`` is the one entry point role CRUD calls: it also clears
+role_service's process-local name → id cache, the only other role cache.
+
+Fails open to a direct DB read whenever Redis is unavailable, like
+rbac_cache_service.
+"""
+from __future__ import annotations
+
+import json
+import uuid
+
+from sqlalchemy.orm import Session
+
+from app.core.logger import logger
+from app.models.role import Role
+from app.schemas.role import RoleOut
+from app.services.role_service import clear_role_cache
+from app.utils.redis_client import get_redis_sync
+
+TTL_SECONDS = 60
+
+_GENERATION_KEY = "roles:gen"
+
+
+def _generation(redis_client) -> str:
+    return redis_client.get(_GENERATION_KEY) or "0"
+
+
+def _read(redis_client, key_suffix: str) -> tuple[str | None, object | None]:
+    """Return (full key, decoded cached value); key is None when Redis is unusable."""
+    if redis_client is None:
+        return None, None
+    try:
+        key = f"roles:{_generation(redis_client)}:{key_suffix}"
+        cached = redis_client.get(key)
+    except Exception:
+        return None, None
+    return key, (json.loads(cached) if cached is not None else None)
+
+
+def _write(redis_client, key: str | None, value) -> None:
+    if key is None:
+        return
+    try:
+        redis_client.set(key, json.dumps(value), ex=TTL_SECONDS)
+    except Exception as exc:
+        logger.debug("Role cache write failed for %s: %s", key, exc)
+
+
+def list_roles(db: Session, skip: int, limit: int) -> list[dict]:
+    """Cached page of roles, serialized as RoleOut dicts."""
+    redis_client = get_redis_sync()
+    key, cached = _read(redis_client, f"list:{skip}:{limit}")
+    if cached is not None:
+        return cached
+
+    roles = db.query(Role).offset(skip).limit(limit).all()
+    value = [RoleOut.model_validate(r).model_dump(mode="json") for r in roles]
+    _write(redis_client, key, value)
+    return value
+
+
+def get_role(db: Session, role_id: uuid.UUID) -> dict | None:
+    """Cached single role as a RoleOut dict; None when it does not exist (not cached)."""
+    redis_client = get_redis_sync()
+    key, cached = _read(redis_client, f"id:{role_id}")
+    if cached is not None:
+        return cached
+
+    role = db.query(Role).filter(Role.id == role_id).first()
+    if role is None:
+        return None
+    value = RoleOut.model_validate(role).model_dump(mode="json")
+    _write(redis_client, key, value)
+    return value
+
+
+def invalidate() -> None:
+    """Drop every cached role — call after any role create/update/delete."""
+    clear_role_cache()
+    redis_client = get_redis_sync()
+    if redis_client is None:
+        return
+    try:
+        redis_client.incr(_GENERATION_KEY)
+    except Exception as exc:
+        logger.warning("Role cache invalidation failed: %s", exc)
@@ -3,6 +3,8 @@ from app.models.role import Role
 from app.models.product import Product
 from app.core.product_enums import ProductName
 from app.models.user import user_tenant_association
+from dataclasses import dataclass
+import time
 import uuid
 
 # ─────────────────────────────────────────────────────────── RBAC hierarchy ──
@@ -34,6 +36,58 @@ ROLE_RANK = {
 BILLING_ALLOWED_ROLES = frozenset({ADMIN, MANAGER, BILLING_ONLY, OWNER})
 
 
+# Process-local name → id cache for the role catalog. Rows are effectively
+# immutable, so this skips a SELECT per lookup; the TTL bounds staleness on
+# workers that did not see a role CRUD call (which clears the cache locally).
+# Role names and descriptions that end up in tokens or RBAC checks are never
+# served from here: they are joined in the membership queries below.
+ROLE_CACHE_TTL_SECONDS = 300
+
+_role_id_cache: dict[str, tuple[uuid.UUID, float]] = {}
+
+
+@dataclass(frozen=True)
+class RoleSnapshot:
+    """Detached, read-only copy of a ``Role`` row's id, name and description."""
+
+    id: uuid.UUID
+    name: str
+    description: str | None
+
+
+def get_role_id_by_name(db: Session, name: str) -> uuid.UUID | None:
+    """Cached ``Role.id`` for a role name; None when no such role exists."""
+    now = time.monotonic()
+    cached = _role_id_cache.get(name)
+    if cached is not None and cached[1] > now:
+        return cached[0]
+
+    role_id = db.query(Role.id).filter(Role.name == name).scalar()
+    if role_id is None:
+        # Negative results are not cached so a freshly seeded role is picked up.
+        _role_id_cache.pop(name, None)
+        return None
+    _role_id_cache[name] = (role_id, now + ROLE_CACHE_TTL_SECONDS)
+    return role_id
+
+
+def get_role_by_id(db: Session, role_id: uuid.UUID) -> RoleSnapshot | None:
+    """Role row for an id, read from the database; None when no such role exists."""
+    row = (
+        db.query(Role.id, Role.name, Role.description)
+        .filter(Role.id == role_id)
+        .first()
+    )
+    if row is None:
+        return None
+    return RoleSnapshot(id=row.id, name=row.name, description=row.description)
+
+
+def clear_role_cache() -> None:
+    """Drop every cached role id — call after any role create/update/delete."""
+    _role_id_cache.clear()
+
+
 def has_rank(role_name: str | None, required: str) -> bool:
     """True if ``role_name`` is at or above ``required`` in the linear chain.
 
@@ -47,17 +101,61 @@ def can_access_billing(role_name: str | None) -> bool:
     return role_name in BILLING_ALLOWED_ROLES
 
 
+_OWNER_DISPLAY = {
+    "name": "owner",
+    "description": "Owner role with full access to tenant",
+}
+_READ_ONLY_DISPLAY = {
+    "name": READ_ONLY,
+    "description": "Read-only access; blocked from mutating endpoints",
+}
+
+
+def _display_details(is_creator: bool, role: RoleSnapshot | None) -> dict:
+    if is_creator:
+        return dict(_OWNER_DISPLAY)
+    if role is None:
+        return dict(_READ_ONLY_DISPLAY)
+    return {"name": role.name, "description": role.description}
+
+
 def get_display_role_details(
     db: Session, user_id: uuid.UUID, tenant_id: uuid.UUID
 ) -> dict | None:
     """Resolve display role details (name and description) for a (user, tenant).
     If the user is the workspace creator (is_creator=True), returns name='owner'.
     """
-    row = (
+    membership = get_membership_role_details(db, user_id, tenant_id)
+    return membership[1] if membership is not None else None
+
+
+def _membership_query(db: Session, *columns):
+    """Association rows with their assigned role's name and description joined in."""
+    return (
         db.query(
+            *columns,
             user_tenant_association.c.is_creator,
             user_tenant_association.c.role_id,
+            Role.name.label("role_name"),
+            Role.description.label("role_description"),
         )
+        .select_from(user_tenant_association)
+        .outerjoin(Role, Role.id == user_tenant_association.c.role_id)
+    )
+
+
+def get_membership_role_details(
+    db: Session, user_id: uuid.UUID, tenant_id: uuid.UUID
+) -> tuple[RoleSnapshot | None, dict] | None:
+    """Membership check, assigned role and display details in one query.
+
+    Returns ``None`` when the user is not a member of the tenant, otherwise
+    ``(role, display)`` where ``role`` carries the id/name/description
+    ``get_user_role_in_tenant`` would return and ``display`` is what
+    ``get_display_role_details`` would.
+    """
+    row = (
+        _membership_query(db)
         .filter(
             user_tenant_association.c.user_id == user_id,
             user_tenant_association.c.tenant_id == tenant_id,
@@ -67,30 +165,37 @@ def get_display_role_details(
     if row is None:
         return None
 
-    is_creator, role_id = row
-    if is_creator:
-        return {
-            "name": "owner",
-            "description": "Owner role with full access to tenant",
-        }
+    return resolve_membership_role(row)
 
-    if role_id is None:
-        return {
-            "name": READ_ONLY,
-            "description": "Read-only access; blocked from mutating endpoints",
-        }
 
-    role = db.query(Role).filter(Role.id == role_id).first()
-    if role:
-        return {
-            "name": role.name,
-            "description": role.description,
-        }
-    return {
-        "name": READ_ONLY,
-        "description": "Read-only access; blocked from mutating endpoints",
-    }
+def get_user_memberships(db: Session, user_id: uuid.UUID) -> list:
+    """Every membership row of a user, with its assigned role joined in.
 
+    Rows carry ``tenant_id``, ``product_id``, ``is_creator``, ``role_id``,
+    ``role_name`` and ``role_description``. One query, for callers that need
+    the tenant ids and the current tenant's role/product together (login).
+    """
+    return (
+        _membership_query(
+            db,
+            user_tenant_association.c.tenant_id,
+            user_tenant_association.c.product_id,
+        )
+        .filter(user_tenant_association.c.user_id == user_id)
+        .all()
+    )
+
+
+def resolve_membership_role(membership) -> tuple[RoleSnapshot | None, dict]:
+    """``(role, display)`` for a row from ``get_user_memberships``."""
+    role = None
+    if membership.role_name is not None:
+        role = RoleSnapshot(
+            id=membership.role_id,
+            name=membership.role_name,
+            description=membership.role_description,
+        )
+    return role, _display_details(membership.is_creator, role)
 
 
 def get_membership_role_name(
@@ -103,16 +208,19 @@ def get_membership_role_name(
     (never rejected) per the RBAC matrix. The workspace creator's
     ``is_creator`` flag always resolves to ``admin``, regardless of whatever
     role_id is stored on the row.
+
+    This is an authorization check, so the role name is joined in the same
+    query rather than read from the process-local role cache: a role change
+    made on another worker takes effect on the next request.
     """
     # db.query(), not db.execute(select(...)) — some tests wrap the session
     # to intercept execute() generically for unrelated raw-SQL mocking
     # (e.g. pgvector search); .query() passes through untouched, matching
     # the convention of every other lookup in this module.
     row = (
-        db.query(
-            user_tenant_association.c.is_creator,
-            user_tenant_association.c.role_id,
-        )
+        db.query(user_tenant_association.c.is_creator, Role.name)
+        .select_from(user_tenant_association)
+        .outerjoin(Role, Role.id == user_tenant_association.c.role_id)
         .filter(
             user_tenant_association.c.user_id == user_id,
             user_tenant_association.c.tenant_id == tenant_id,
@@ -122,14 +230,10 @@ def get_membership_role_name(
     if row is None:
         return None
 
-    is_creator, role_id = row
+    is_creator, role_name = row
     if is_creator:
         return ADMIN
-    if role_id is None:
-        return READ_ONLY
-
-    role = db.query(Role).filter(Role.id == role_id).first()
-    return role.name if role else READ_ONLY
+    return role_name or READ_ONLY
 
 
 def get_default_product_id(db: Session) -> uuid.UUID | None:
@@ -137,8 +241,8 @@ def get_default_product_id(db: Session) -> uuid.UUID | None:
     return product.id if product else None
 
 def assign_role_to_user_tenant(db: Session, user_id: uuid.UUID, tenant_id: uuid.UUID, role_name: str):
-    role = db.query(Role).filter(Role.name == role_name).first()
-    if not role:
+    role_id = get_role_id_by_name(db, role_name)
+    if not role_id:
         return None
     default_product_id = get_default_product_id(db)
     
@@ -146,7 +250,7 @@ def assign_role_to_user_tenant(db: Session, user_id: uuid.UUID, tenant_id: uuid.
         user_tenant_association.update().where(
             (user_tenant_association.c.user_id == user_id) & 
             (user_tenant_association.c.tenant_id == tenant_id)
-        ).values(role_id=role.id, product_id=default_product_id)
+        ).values(role_id=role_id, product_id=default_product_id)
     )
     
     if result.rowcount == 0:
@@ -154,7 +258,7 @@ def assign_role_to_user_tenant(db: Session, user_id: uuid.UUID, tenant_id: uuid.
             user_tenant_association.insert().values(
                 user_id=user_id,
                 tenant_id=tenant_id,
-                role_id=role.id,
+                role_id=role_id,
                 product_id=default_product_id,
             )
         )
@@ -48,7 +48,9 @@ def find_or_create_user(db: Session, email: str, workspace_id: uuid.UUID) -> tup
             email=email,
             first_name="SSO",
             last_name="User",
-            hashed_password=get_password_hash(uuid.uuid4().hex),  # Random unusable password
+            # Random unusable password; nobody ever types it, so the minimum
+            # bcrypt cost is enough and keeps SSO sign-up off the hashing budget.
+            hashed_password=get_password_hash(uuid.uuid4().hex, rounds=4),
         )
         db.add(user)
         db.flush()
@@ -0,0 +1,17 @@
+"""Tenant creation shared by the v1 tenant and registration endpoints."""
+from __future__ import annotations
+
+from sqlalchemy.orm import Session
+
+from app.models.tenant import Tenant
+from app.repositories.workspace_repository import WorkspaceRepository
+
+
+def insert_tenant(db: Session, name: str) -> Tenant:
+    """Insert a pending_payment tenant with a unique schema_name (not committed).
+
+    A duplicate active tenant name raises ``IntegrityError``
+    (uq_tenant_name_active); the calling endpoint owns the transaction, so it
+    rolls back and reports the conflict.
+    """
+    return WorkspaceRepository(db).insert(name, status="pending_payment", credits=50)
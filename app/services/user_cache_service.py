@@ -0,0 +1,152 @@
+"""Process-local snapshot cache for the authenticated-user lookup.
+
+Every JWT-protected request resolves its user by primary key. The column
+values of that active (non soft-deleted) row are kept here for TTL_SECONDS and
+re-attached to the request's session with ``Session.merge(load=False)``, so a
+warm worker skips the ``SELECT ... FROM "user"`` while handlers still get a
+session-bound ``User`` they can read, mutate and commit.
+
+Only deep copies of the column values are cached, never an ORM instance or
+a mutable JSON value shared between sessions. Each entry records the
+user's Redis version key (users:gen:<id>) it was loaded under; an ORM
+update/delete of a User replaces that user's version once the transaction
+commits (events below), so every worker drops that one snapshot, including
+the one of a user just deactivated or soft-deleted, while other users stay
+cached. Core/raw-SQL writes to the user table must call ``invalidate()``
+themselves after committing. Without Redis the cache is bypassed, like
+role_cache_service falls back to the database.
+"""
+from __future__ import annotations
+
+import copy
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from functools import lru_cache
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached, object_session
+from sqlalchemy.orm.util import identity_key
+
+from app.core.logger import logger
+from app.models.user import User
+from app.utils.redis_client import get_redis_sync
+
+TTL_SECONDS = 30
+MAX_ENTRIES = 10_000
+
+# A version key only has to outlive the entries stamped with it; a fresh
+# random value per bump means an expired key can never be matched again.
+_GENERATION_KEY_TTL_SECONDS = 2 * TTL_SECONDS
+
+# session.info key for users flushed in the session's open transaction.
+_PENDING_KEY = "user_cache_service.pending_invalidations"
+
+_user_cache: "OrderedDict[uuid.UUID, tuple[dict, float, str]]" = OrderedDict()
+_user_cache_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _column_keys() -> tuple[str, ...]:
+    # Resolved on first use: reading column_attrs configures every mapper,
+    # which at import time runs before Tenant and friends are defined.
+    return tuple(attr.key for attr in User.__mapper__.column_attrs)
+
+
+def _generation_key(user_id: uuid.UUID) -> str:
+    return f"users:gen:{user_id}"
+
+
+def generation(user_id: uuid.UUID) -> str | None:
+    """The user's shared cache version; None when Redis is unusable (cache bypassed).
+
+    Read it before loading the row that is later passed to ``store()``, so a
+    write committed in between leaves the entry already stale.
+    """
+    redis_client = get_redis_sync()
+    if redis_client is None:
+        return None
+    try:
+        return redis_client.get(_generation_key(user_id)) or "0"
+    except Exception:
+        return None
+
+
+def get(db: Session, user_id: uuid.UUID, current_generation: str | None) -> User | None:
+    """Cached active user attached to ``db``; None on a miss, expired or stale entry."""
+    if current_generation is None:
+        return None
+    now = time.monotonic()
+    with _user_cache_lock:
+        cached = _user_cache.get(user_id)
+        if cached is None:
+            return None
+        if cached[1] <= now or cached[2] != current_generation:
+            del _user_cache[user_id]
+            return None
+        _user_cache.move_to_end(user_id)
+    # Already loaded by this request: hand back that instance as a query
+    # would, instead of merging the snapshot over what the request changed.
+    present = db.identity_map.get(identity_key(User, user_id))
+    if present is not None:
+        return present
+    snapshot = User(**copy.deepcopy(cached[0]))
+    make_transient_to_detached(snapshot)
+    return db.merge(snapshot, load=False)
+
+
+def store(user: User, loaded_generation: str | None) -> None:
+    """Remember the column values of an active user loaded under ``loaded_generation``."""
+    if loaded_generation is None:
+        return
+    values = copy.deepcopy({key: getattr(user, key) for key in _column_keys()})
+    with _user_cache_lock:
+        _user_cache[user.id] = (values, time.monotonic() + TTL_SECONDS, loaded_generation)
+        _user_cache.move_to_end(user.id)
+        # Evict the least recently used entries rather than every warm user.
+        while len(_user_cache) > MAX_ENTRIES:
+            _user_cache.popitem(last=False)
+
+
+def invalidate(user_id: uuid.UUID) -> None:
+    """Drop the cached row for one user in every worker — call after any non-ORM write to it."""
+    with _user_cache_lock:
+        _user_cache.pop(user_id, None)
+    _bump_generation(user_id)
+
+
+def _bump_generation(user_id: uuid.UUID) -> None:
+    redis_client = get_redis_sync()
+    if redis_client is None:
+        return
+    try:
+        redis_client.set(
+            _generation_key(user_id), uuid.uuid4().hex, ex=_GENERATION_KEY_TTL_SECONDS
+        )
+    except Exception as exc:
+        logger.warning("User cache invalidation failed for %s: %s", user_id, exc)
+
+
+def clear() -> None:
+    """Drop every cached user."""
+    with _user_cache_lock:
+        _user_cache.clear()
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _defer_invalidation(mapper, connection, target: User) -> None:
+    # Flush time is too early: until the commit, a concurrent lookup still
+    # reads (and would re-cache) the old row. Evict when the write is visible.
+    session = object_session(target)
+    if session is None:
+        invalidate(target.id)
+        return
+    session.info.setdefault(_PENDING_KEY, set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    for user_id in session.info.pop(_PENDING_KEY, ()):
+        invalidate(user_id)
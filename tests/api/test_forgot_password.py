@@ -0,0 +1,65 @@
+"""
+Tests for POST /api/v1/users/forgot-password.
+
+The reset email is sent from a background task after the response; a failed
+send retires the freshly issued reset token.
+"""
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app.core.security import hash_password_reset_token
+from app.models.password_reset import PasswordResetToken
+from app.models.user import User
+
+
+def _latest_reset_token(db, email: str) -> PasswordResetToken:
+    user = db.query(User).filter(User.email == email).first()
+    token = (
+        db.query(PasswordResetToken)
+        .filter(PasswordResetToken.user_id == user.id)
+        .order_by(PasswordResetToken.created_at.desc())
+        .first()
+    )
+    db.refresh(token)
+    return token
+
+
+def test_reset_email_sent_after_response(client: TestClient, db):
+    with patch(
+        "app.api.api_v1.endpoints.user.email_service.send_password_reset_email",
+        return_value=True,
+    ) as send:
+        resp = client.post(
+            "/api/v1/users/forgot-password", json={"email": "Test@Example.com"}
+        )
+
+    assert resp.status_code == 200, resp.text
+    token = _latest_reset_token(db, "test@example.com")
+    assert token.used is False
+    # Only the digest is stored; the raw token goes out in the email.
+    emailed = send.call_args.kwargs["reset_token"]
+    assert emailed != token.token
+    assert hash_password_reset_token(emailed) == token.token
+    assert send.call_args.kwargs["email"] == "test@example.com"
+
+
+def test_failed_send_retires_reset_token(client: TestClient, db):
+    from tests.conftest import TestingSessionLocal
+
+    with patch(
+        "app.api.api_v1.endpoints.user.email_service.send_password_reset_email",
+        return_value=False,
+    ), patch(
+        "app.api.api_v1.endpoints.user.SessionLocal",
+        TestingSessionLocal,
+    ):
+        resp = client.post(
+            "/api/v1/users/forgot-password", json={"email": "test@example.com"}
+        )
+
+    # The email goes out after the response, so the request itself succeeds.
+    assert resp.status_code == 200, resp.text
+    assert _latest_reset_token(db, "test@example.com").used is True
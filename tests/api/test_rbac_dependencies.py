@@ -189,3 +189,14 @@ class TestNonMemberRejection:
             dependency(user=stranger, db=db)
         assert exc_info.value.status_code == 403
         assert "not a member" in str(exc_info.value.detail).lower()
+
+
+# ─────────────────────────────────────────────────────── query footprint ──
+
+def test_require_admin_leaves_tenants_lazy(db, tenant):
+    from sqlalchemy import inspect
+
+    admin_user = _make_member(db, tenant.id, "admin")
+    result = require_admin(user=admin_user, db=db)
+    assert "tenants" in inspect(result).unloaded
+    assert [t.id for t in result.tenants] == [tenant.id]
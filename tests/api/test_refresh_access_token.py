@@ -24,7 +24,7 @@ _TEST_LOGIN_PASSWORD = "testpass"
 
 @pytest.fixture(scope="module", autouse=True)
 def _ensure_known_password(db):
-    """conftest's bcrypt hash may not match across passlib/bcrypt versions."""
+    """Give the seeded user a known password hashed with the current scheme (argon2id/bcrypt)."""
     u = db.query(User).filter(User.email == "test@example.com").first()
     if u is None:
         raise RuntimeError("test@example.com user missing from conftest db")
@@ -121,3 +121,30 @@ class TestRefreshAccessToken:
             "Access token from refresh must reflect current_tenant_id when role is unchanged; "
             f"expected tenant {t2.id}, got claim {p2.get('tenant_id')!r}"
         )
+
+
+@pytest.mark.usefixtures("client", "db")
+class TestLogout:
+    def test_logout_revokes_refresh_token(self, client: TestClient):
+        r = client.post(
+            "/api/v1/users/login",
+            json={"email": "test@example.com", "password": _TEST_LOGIN_PASSWORD},
+        )
+        assert r.status_code == 200, r.text
+        data = r.json()["data"]
+
+        out = client.post(
+            "/api/v1/users/logout",
+            headers={"Authorization": f"Bearer {data['access_token']}"},
+        )
+        assert out.status_code == 200, out.text
+
+        r2 = client.post("/api/v1/users/refresh", json={"refresh_token": data["refresh_token"]})
+        assert r2.status_code == 401, r2.text
+
+    def test_logout_rejects_invalid_token(self, client: TestClient):
+        out = client.post(
+            "/api/v1/users/logout",
+            headers={"Authorization": "Bearer not-a-jwt"},
+        )
+        assert out.status_code == 401
@@ -0,0 +1,61 @@
+"""POST /api/v1/users/register — user, personal tenant and owner membership
+are written in one transaction.
+"""
+from __future__ import annotations
+
+import uuid
+
+from fastapi.testclient import TestClient
+
+from app.models.tenant import Tenant
+from app.models.user import User, user_tenant_association
+
+
+def _payload(email: str) -> dict:
+    return {
+        "email": email,
+        "first_name": "New",
+        "last_name": "User",
+        "password": "Str0ng!Passw0rd",
+    }
+
+
+def test_register_creates_personal_tenant_membership(client: TestClient, db):
+    email = f"Register-{uuid.uuid4().hex[:6]}@Example.com"
+    resp = client.post("/api/v1/users/register", json=_payload(email))
+
+    assert resp.status_code == 200, resp.text
+    user = db.query(User).filter(User.email == email.lower()).one()
+    tenant = db.query(Tenant).filter(Tenant.id == user.current_tenant_id).one()
+    assert tenant.name == email.lower()
+    membership = db.execute(
+        user_tenant_association.select().where(
+            user_tenant_association.c.user_id == user.id
+        )
+    ).all()
+    assert [row.tenant_id for row in membership] == [tenant.id]
+    data = resp.json()["data"]
+    assert data["join_date"] and data["join_date"] == data["created_at"]
+
+
+def test_register_duplicate_email_creates_nothing(client: TestClient, db):
+    email = f"dupe-{uuid.uuid4().hex[:6]}@example.com"
+    assert client.post("/api/v1/users/register", json=_payload(email)).status_code == 200
+
+    resp = client.post("/api/v1/users/register", json=_payload(email))
+
+    assert resp.status_code == 400
+    assert db.query(User).filter(User.email == email).count() == 1
+    assert db.query(Tenant).filter(Tenant.name == email).count() == 1
+
+
+def test_register_taken_tenant_name_rolls_back_the_user(client: TestClient, db):
+    email = f"taken-{uuid.uuid4().hex[:6]}@example.com"
+    db.add(Tenant(name=email, schema_name=f"s_{uuid.uuid4().hex[:6]}", status="active"))
+    db.commit()
+
+    resp = client.post("/api/v1/users/register", json=_payload(email))
+
+    assert resp.status_code == 400, resp.text
+    assert db.query(User).filter(User.email == email).count() == 0
+    assert db.query(Tenant).filter(Tenant.name == email).count() == 1
@@ -0,0 +1,203 @@
+"""POST /api/v1/tenants/create and /switch — schema_name allocation, name
+conflicts and membership checks.
+
+The endpoint inserts with ON CONFLICT (schema_name) DO NOTHING and retries
+with a suffixed schema name, while a duplicate active tenant name is left to
+uq_tenant_name_active and surfaces as a 400.
+"""
+
+from __future__ import annotations
+
+import uuid
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from jose import jwt
+
+from app.repositories.workspace_repository import generate_schema_name
+from app.core.security import create_user_token
+from app.core.workspace import Workspace
+from app.models.tenant import Tenant
+from app.models.role import Role
+from app.models.user import User, user_tenant_association
+
+
+@pytest.fixture
+def creator(db) -> User:
+    u = User(
+        email=f"creator-{uuid.uuid4().hex[:6]}@example.com",
+        first_name="Creator",
+        last_name="User",
+        hashed_password="",
+    )
+    db.add(u)
+    db.commit()
+    db.refresh(u)
+    return u
+
+
+def _auth_headers(user: User) -> dict:
+    token = create_user_token(user_id=user.id, email=user.email, tenant_id=None)
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("Acme", "acme_schema"),
+        ("Acme Corp, Inc.", "acme_corp_inc_schema"),
+        ("  --My__Shop--  ", "my_shop_schema"),
+        ("Café 42", "caf_42_schema"),
+    ],
+)
+def test_generate_schema_name(name, expected):
+    assert generate_schema_name(name) == expected
+
+
+class TestCreateTenant:
+    def test_schema_name_collision_gets_suffix(self, client: TestClient, db, creator):
+        suffix = uuid.uuid4().hex[:6]
+        first = client.post(
+            "/api/v1/tenants/create",
+            json={"name": f"Acme {suffix}"},
+            headers=_auth_headers(creator),
+        )
+        assert first.status_code == 200, first.text
+        assert first.json()["data"]["role"]["name"] == "admin"
+
+        # Different name, same generated schema name ("acme_<suffix>_schema").
+        second = client.post(
+            "/api/v1/tenants/create",
+            json={"name": f"acme-{suffix}"},
+            headers=_auth_headers(creator),
+        )
+        assert second.status_code == 200, second.text
+
+        schema_names = [
+            t.schema_name
+            for t in db.query(Tenant).filter(Tenant.schema_name.like(f"acme_{suffix}_%schema"))
+        ]
+        assert sorted(schema_names) == [f"acme_{suffix}_1_schema", f"acme_{suffix}_schema"]
+
+    def test_creator_linked_as_admin_and_switched(self, client: TestClient, db, creator):
+        resp = client.post(
+            "/api/v1/tenants/create",
+            json={"name": f"Linked {uuid.uuid4().hex[:6]}"},
+            headers=_auth_headers(creator),
+        )
+        assert resp.status_code == 200, resp.text
+        tenant_id = uuid.UUID(resp.json()["data"]["tenant_id"])
+
+        role_id = db.query(user_tenant_association.c.role_id).filter(
+            user_tenant_association.c.user_id == creator.id,
+            user_tenant_association.c.tenant_id == tenant_id,
+        ).scalar()
+        assert role_id == db.query(Role.id).filter(Role.name == "admin").scalar()
+
+        db.refresh(creator)
+        assert creator.current_tenant_id == tenant_id
+
+    def test_duplicate_active_name_returns_400(self, client: TestClient, creator):
+        name = f"Dup {uuid.uuid4().hex[:6]}"
+        first = client.post(
+            "/api/v1/tenants/create", json={"name": name}, headers=_auth_headers(creator)
+        )
+        assert first.status_code == 200, first.text
+
+        second = client.post(
+            "/api/v1/tenants/create", json={"name": name}, headers=_auth_headers(creator)
+        )
+        assert second.status_code == 400, second.text
+        assert "You already have a tenant with this name" in second.text
+
+
+@pytest.fixture
+def middleware_workspace(db):
+    """Resolve the JWT's workspace from the test DB instead of the async engine."""
+
+    async def _load(workspace_id):
+        tenant = db.get(Tenant, workspace_id)
+        return Workspace.from_mapping(
+            {
+                "id": str(tenant.id),
+                "name": tenant.name,
+                "schema_name": tenant.schema_name,
+                "status": tenant.status,
+                "credits": 0.0,
+                "stripe_customer_id": None,
+                "stripe_subscription_id": None,
+            }
+        )
+
+    with patch("app.middleware.api_key_middleware._load_workspace", side_effect=_load):
+        yield
+
+
+@pytest.mark.usefixtures("middleware_workspace")
+class TestSwitchTenant:
+    def _create(self, client: TestClient, user: User) -> dict:
+        resp = client.post(
+            "/api/v1/tenants/create",
+            json={"name": f"Switch {uuid.uuid4().hex[:6]}"},
+            headers=_auth_headers(user),
+        )
+        assert resp.status_code == 200, resp.text
+        return resp.json()["data"]
+
+    def test_switch_to_member_tenant(self, client: TestClient, db, creator):
+        first = self._create(client, creator)["tenant_id"]
+        second = self._create(client, creator)
+
+        resp = client.post(
+            "/api/v1/tenants/switch",
+            json={"tenant_id": first},
+            headers={"Authorization": f"Bearer {second['access_token']}"},
+        )
+        assert resp.status_code == 200, resp.text
+        data = resp.json()["data"]
+        assert data["tenant_id"] == first
+        # Field(exclude=True) keeps tenant_ids and the role id out of the body
+        assert "tenant_ids" not in data
+        assert "id" not in data["role"]
+
+        db.refresh(creator)
+        assert str(creator.current_tenant_id) == first
+
+    def test_switch_to_foreign_tenant_is_denied(self, client: TestClient, creator):
+        own = self._create(client, creator)
+        resp = client.post(
+            "/api/v1/tenants/switch",
+            json={"tenant_id": str(uuid.uuid4())},
+            headers={"Authorization": f"Bearer {own['access_token']}"},
+        )
+        assert resp.status_code == 401, resp.text
+        assert "Access denied" in resp.text
+
+    def test_switch_signs_the_current_role_name(self, client: TestClient, db, creator):
+        first = self._create(client, creator)["tenant_id"]
+        second = self._create(client, creator)
+        role = Role(name=f"temp-{uuid.uuid4().hex[:6]}", description="temp")
+        db.add(role)
+        db.commit()
+        db.execute(
+            user_tenant_association.update()
+            .where(
+                user_tenant_association.c.user_id == creator.id,
+                user_tenant_association.c.tenant_id == uuid.UUID(first),
+            )
+            .values(role_id=role.id)
+        )
+        # Renamed without clearing any cache, as on another worker.
+        role.name = f"renamed-{uuid.uuid4().hex[:6]}"
+        db.commit()
+
+        resp = client.post(
+            "/api/v1/tenants/switch",
+            json={"tenant_id": first},
+            headers={"Authorization": f"Bearer {second['access_token']}"},
+        )
+        assert resp.status_code == 200, resp.text
+        data = resp.json()["data"]
+        assert data["role"]["name"] == role.name
+        assert jwt.get_unverified_claims(data["access_token"])["role"] == role.name
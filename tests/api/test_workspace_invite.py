@@ -146,6 +146,26 @@ class TestInviteSuccess:
         assert resp.status_code == 201
         assert "token" not in resp.json()["data"]
 
+    def test_failed_send_marks_invite_send_failed(self, authed_client, db):
+        from tests.conftest import TestingSessionLocal
+
+        email = f"sendfail-{uuid.uuid4().hex[:6]}@example.com"
+        with patch(
+            "app.api.api_v1.endpoints.workspace_invites.email_service.send_invite_email",
+            return_value=False,
+        ), patch(
+            "app.api.api_v1.endpoints.workspace_invites.SessionLocal",
+            TestingSessionLocal,
+        ):
+            resp = authed_client.post("/api/v1/workspace/invite", json={"email": email})
+
+        # The email goes out after the response, so the request itself succeeds.
+        assert resp.status_code == 201, resp.text
+
+        invite = db.query(Invite).filter(Invite.email == email).first()
+        db.refresh(invite)
+        assert invite.status == "send_failed"
+
 
 # ---------------------------------------------------------------------------
 # POST /api/v1/workspace/invite — duplicate → 409
@@ -374,3 +394,109 @@ class TestRoleBasedInvitations:
         assert assoc.role_id == manager_role.id
 
 
+
+
+# ---------------------------------------------------------------------------
+# POST /api/v1/accept-invite — claim, existing users and atomicity
+# ---------------------------------------------------------------------------
+
+def _pending_invite(db, admin_user, email: str, tenant_id=None) -> Invite:
+    invite = Invite(
+        email=email,
+        tenant_id=tenant_id or admin_user.current_tenant_id,
+        invited_by=admin_user.id,
+        token=secrets.token_urlsafe(32),
+        expires_at=datetime.now(timezone.utc) + timedelta(days=7),
+        status="pending",
+    )
+    db.add(invite)
+    db.commit()
+    return invite
+
+
+def _memberships(db, user_id, tenant_id) -> int:
+    from app.models.user import user_tenant_association
+
+    return db.query(user_tenant_association).filter(
+        user_tenant_association.c.user_id == user_id,
+        user_tenant_association.c.tenant_id == tenant_id,
+    ).count()
+
+
+def _tenant_memberships(db, tenant_id) -> int:
+    from app.models.user import user_tenant_association
+
+    return db.query(user_tenant_association).filter(
+        user_tenant_association.c.tenant_id == tenant_id,
+    ).count()
+
+
+class TestAcceptInviteFlow:
+    def test_same_invite_accepted_twice_only_first_wins(self, client, db, admin_user):
+        email = f"twice-{uuid.uuid4().hex[:6]}@example.com"
+        invite = _pending_invite(db, admin_user, email)
+        url = f"/api/v1/accept-invite/accept-invite?token={invite.token}&password=secret123"
+
+        first = client.post(url)
+        second = client.post(url)
+
+        assert first.status_code == 200, first.text
+        assert second.status_code == 404, second.text
+        users = db.query(User).filter(User.email == email).all()
+        assert len(users) == 1
+        assert _memberships(db, users[0].id, admin_user.current_tenant_id) == 1
+
+    def test_existing_user_joins_tenant_once(self, client, db, admin_user, workspace_tenant):
+        other_tenant = Tenant(
+            name=f"Other-{uuid.uuid4().hex[:6]}",
+            schema_name=f"s_{uuid.uuid4().hex[:6]}",
+            status="active",
+        )
+        db.add(other_tenant)
+        db.commit()
+        member = User(
+            email=f"member-{uuid.uuid4().hex[:6]}@example.com",
+            first_name="Existing",
+            last_name="Member",
+            hashed_password="",
+            current_tenant_id=workspace_tenant.id,
+        )
+        db.add(member)
+        db.commit()
+        invite = _pending_invite(db, admin_user, member.email, tenant_id=other_tenant.id)
+
+        resp = client.post(f"/api/v1/accept-invite/accept-invite?token={invite.token}&password=")
+        assert resp.status_code == 200, resp.text
+        data = resp.json()["data"]
+        assert data["id"] == str(member.id)
+        assert data["first_name"] == "Existing"
+        assert data["current_tenant_id"] == str(other_tenant.id)
+        assert _memberships(db, member.id, other_tenant.id) == 1
+
+        # A second invitation to the same tenant is refused and stays pending.
+        again = _pending_invite(db, admin_user, member.email, tenant_id=other_tenant.id)
+        resp = client.post(f"/api/v1/accept-invite/accept-invite?token={again.token}&password=")
+        assert resp.status_code == 400, resp.text
+        assert _memberships(db, member.id, other_tenant.id) == 1
+        db.refresh(again)
+        assert again.status == "pending"
+
+    def test_failure_midway_rolls_back_user_membership_and_invite(self, client, db, admin_user):
+        email = f"rollback-{uuid.uuid4().hex[:6]}@example.com"
+        invite = _pending_invite(db, admin_user, email)
+        members_before = _tenant_memberships(db, admin_user.current_tenant_id)
+
+        # Raised after the user and membership inserts, before the commit.
+        with patch(
+            "app.api.api_v1.endpoints.accept_invite.refresh_token_expires_at",
+            side_effect=RuntimeError("boom"),
+        ), pytest.raises(RuntimeError):
+            client.post(f"/api/v1/accept-invite/accept-invite?token={invite.token}&password=secret123")
+        # What get_db's close() does with the request's open transaction.
+        db.rollback()
+
+        assert db.query(User).filter(User.email == email).first() is None
+        assert _tenant_memberships(db, admin_user.current_tenant_id) == members_before
+        db.refresh(invite)
+        assert invite.status == "pending"
+        assert invite.accepted_at is None
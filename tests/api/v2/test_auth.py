@@ -180,3 +180,23 @@ class TestGetCurrentWorkspace:
         )
 
         _assert_unauthorized(resp)
+
+
+def test_each_rejection_raises_a_fresh_exception():
+    # A shared exception instance would grow its traceback on every raise.
+    import asyncio
+
+    from fastapi import HTTPException
+
+    def _reject():
+        try:
+            asyncio.run(
+                get_current_workspace(MagicMock(), x_api_key=None, x_workspace_id=None, db=None)
+            )
+        except HTTPException as exc:
+            return exc
+        raise AssertionError("expected a 401")
+
+    first, second = _reject(), _reject()
+    assert first.status_code == second.status_code == 401
+    assert first is not second
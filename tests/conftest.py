@@ -1,4 +1,5 @@
 # ruff: noqa: E402
+import contextlib
 import contextvars
 import os
 import sys
@@ -73,7 +74,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
@@ -184,6 +185,11 @@ def db():
     _shared_sqlite_conn.rollback()
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
+    # Roles and users are re-seeded per module; drop rows cached by earlier modules.
+    from app.services.role_service import clear_role_cache
+    clear_role_cache()
+    from app.services import user_cache_service
+    user_cache_service.clear()
 
     db = TestingSessionLocal()
     session_token = _active_test_session_var.set(db)
@@ -293,6 +299,66 @@ def db():
         db.close()
 
 
+@pytest.fixture
+def captured_sql(db):
+    """Collect the SQL statements executed on ``db``'s engine.
+
+    ``with captured_sql(lambda sql: "FROM role" in sql) as statements:`` records
+    every statement matching the predicate (all of them when omitted).
+    """
+    @contextlib.contextmanager
+    def _capture(predicate=lambda statement: True):
+        statements: list[str] = []
+
+        def _before(conn, cursor, statement, *args):
+            if predicate(statement):
+                statements.append(statement)
+
+        bind = db.get_bind()
+        event.listen(bind, "before_cursor_execute", _before)
+        try:
+            yield statements
+        finally:
+            event.remove(bind, "before_cursor_execute", _before)
+
+    return _capture
+
+
+class FakeRedis:
+    """In-memory stand-in for the sync redis client (get/set/delete/incr).
+
+    No TTL expiry is simulated; ``calls`` records each operation as
+    ``"<op>:<key>"`` for tests that assert on cache traffic.
+    """
+
+    def __init__(self):
+        self.store: dict[str, str] = {}
+        self.calls: list[str] = []
+
+    def get(self, key: str):
+        self.calls.append(f"get:{key}")
+        return self.store.get(key)
+
+    def set(self, key: str, value: str, ex: int | None = None):
+        self.calls.append(f"set:{key}")
+        self.store[key] = value
+
+    def delete(self, key: str):
+        self.calls.append(f"delete:{key}")
+        self.store.pop(key, None)
+
+    def incr(self, key: str):
+        self.calls.append(f"incr:{key}")
+        self.store[key] = str(int(self.store.get(key, "0")) + 1)
+        return int(self.store[key])
+
+
+@pytest.fixture
+def fake_redis():
+    """A fresh FakeRedis; patch it in as the module's ``get_redis_sync`` result."""
+    return FakeRedis()
+
+
 @pytest.fixture(scope="module")
 def client(db):
     """TestClient sharing the same SQLite database session for the module."""
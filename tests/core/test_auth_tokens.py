@@ -3,7 +3,9 @@ from __future__ import annotations
 
 import uuid
 
-from app.core.auth_tokens import extract_bearer_token, resolve_jwt_auth
+import pytest
+
+from app.core.auth_tokens import extract_bearer_token, parse_claim_uuid, resolve_jwt_auth
 from app.core.security import create_user_token
 
 
@@ -37,3 +39,12 @@ def test_resolve_jwt_auth_missing_tenant():
         role="admin",
     )
     assert resolve_jwt_auth(token) is None
+
+
+def test_parse_claim_uuid_reuses_parsed_value():
+    value = str(uuid.uuid4())
+    first = parse_claim_uuid(value)
+    assert first == uuid.UUID(value)
+    assert parse_claim_uuid(value) is first
+    with pytest.raises(ValueError):
+        parse_claim_uuid("not-a-uuid")
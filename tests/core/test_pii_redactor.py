@@ -335,6 +335,39 @@ class TestPiiLoggingFilter:
         assert "user@trace.com" not in text
         assert REDACTED in text
 
+    def test_formatter_asctime_matches_stdlib(self):
+        fmt = _PiiRedactingFormatter("%(asctime)s %(message)s")
+        stdlib = logging.Formatter("%(asctime)s %(message)s")
+        for created in (1_700_000_000.123, 1_700_000_000.987, 1_700_000_001.5):
+            record = logging.makeLogRecord({"msg": "tick", "created": created, "msecs": (created % 1) * 1000})
+            assert fmt.formatTime(record) == stdlib.formatTime(record)
+
+    def test_queued_handler_writes_redacted_record(self):
+        import io
+
+        from app.core.logger import _start_queue_logging
+
+        stream = io.StringIO()
+        target = logging.StreamHandler(stream)
+        target.setFormatter(_PiiRedactingFormatter("%(levelname)s %(message)s"))
+        queue_handler = _start_queue_logging(target)
+        log = logging.getLogger("tests.queued_logging")
+        log.propagate = False
+        log.addHandler(queue_handler)
+        try:
+            try:
+                raise ValueError("failed for user@queue.com")
+            except ValueError:
+                log.exception("lookup %s", "done")
+        finally:
+            log.removeHandler(queue_handler)
+            queue_handler.listener.stop()
+
+        output = stream.getvalue()
+        assert output.startswith("ERROR lookup done")
+        assert "user@queue.com" not in output
+        assert output.count("Traceback") == 1
+
 
 # ---------------------------------------------------------------------------
 # API error payload helpers
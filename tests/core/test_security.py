@@ -0,0 +1,223 @@
+"""Tests for password hashing and token helpers in app.core.security."""
+from __future__ import annotations
+
+import string
+import time
+import uuid
+from datetime import timedelta
+
+import bcrypt
+import pytest
+from jose import jwt
+from pydantic import ValidationError
+
+from app.core.config import AuthSettings, settings
+from app.core import security
+from app.core.security import create_user_token, get_password_hash, verify_password
+
+
+def test_hash_roundtrip():
+    hashed = get_password_hash("s3cret-pass")
+    assert hashed.startswith("$argon2id$")
+    assert verify_password("s3cret-pass", hashed)
+    assert not verify_password("wrong-pass", hashed)
+
+
+def test_bcrypt_scheme_roundtrip(monkeypatch):
+    monkeypatch.setattr(settings, "PASSWORD_HASH_SCHEME", "bcrypt")
+    hashed = get_password_hash("s3cret-pass")
+    assert hashed.startswith("$2b$")
+    assert verify_password("s3cret-pass", hashed)
+    assert not verify_password("wrong-pass", hashed)
+
+
+def test_hash_uses_configured_rounds(monkeypatch):
+    monkeypatch.setattr(settings, "PASSWORD_HASH_SCHEME", "bcrypt")
+    monkeypatch.setattr(settings, "PASSWORD_BCRYPT_ROUNDS", 5)
+    assert get_password_hash("pw").split("$")[2] == "05"
+
+
+def test_hash_rounds_override(monkeypatch):
+    monkeypatch.setattr(settings, "PASSWORD_BCRYPT_ROUNDS", 12)
+    hashed = get_password_hash("pw", rounds=4)
+    assert hashed.split("$")[2] == "04"
+    assert verify_password("pw", hashed)
+
+
+def test_verify_accepts_hashes_with_other_rounds():
+    legacy = bcrypt.hashpw(b"legacy-pass", bcrypt.gensalt(rounds=4)).decode()
+    assert verify_password("legacy-pass", legacy)
+
+
+def test_verify_rejects_empty_hash():
+    # Provider-only (Google/SSO) accounts store an empty hashed_password.
+    assert verify_password("anything", "") is False
+
+
+def test_verify_rejects_malformed_argon2_hash():
+    assert verify_password("anything", "$argon2id$garbage") is False
+
+
+def test_bcrypt_hash_needs_rehash_to_argon2():
+    legacy = bcrypt.hashpw(b"legacy-pass", bcrypt.gensalt(rounds=4)).decode()
+    assert security.password_needs_rehash(legacy)
+    assert not security.password_needs_rehash(get_password_hash("pw"))
+    assert not security.password_needs_rehash("")
+
+
+def test_argon2_hash_with_old_parameters_needs_rehash(monkeypatch):
+    monkeypatch.setattr(settings, "PASSWORD_ARGON2_MEMORY_COST", 8192)
+    hashed = get_password_hash("pw")
+    monkeypatch.undo()
+    assert verify_password("pw", hashed)
+    assert security.password_needs_rehash(hashed)
+
+
+def test_no_rehash_when_bcrypt_is_configured(monkeypatch):
+    monkeypatch.setattr(settings, "PASSWORD_HASH_SCHEME", "bcrypt")
+    legacy = bcrypt.hashpw(b"legacy-pass", bcrypt.gensalt(rounds=4)).decode()
+    assert not security.password_needs_rehash(legacy)
+
+
+def test_user_token_signed_on_every_call(monkeypatch):
+    signed = []
+    real_create = security.create_access_token
+
+    def _counting_create(*args, **kwargs):
+        signed.append(1)
+        return real_create(*args, **kwargs)
+
+    monkeypatch.setattr(security, "create_access_token", _counting_create)
+    user_id, tenant_id = uuid.uuid4(), uuid.uuid4()
+    create_user_token(user_id, "a@example.com", tenant_id, "admin")
+    create_user_token(user_id, "a@example.com", tenant_id, "admin")
+    assert len(signed) == 2
+
+
+def test_hmac_encoder_matches_jose(monkeypatch):
+    monkeypatch.setattr(settings, "SECRET_KEY", "unit-test-secret")
+    monkeypatch.setattr(settings, "ALGORITHM", "HS256")
+    claims = {"user_id": str(uuid.uuid4()), "iat": 1_700_000_000, "type": "access", "exp": 1_700_000_900}
+    signer = security._hmac_signer(settings.SECRET_KEY, settings.ALGORITHM)
+    assert security._encode_hmac_jwt(dict(claims), *signer) == jwt.encode(
+        claims, "unit-test-secret", algorithm="HS256"
+    )
+
+
+def test_access_token_verifies_with_jose(monkeypatch):
+    monkeypatch.setattr(settings, "SECRET_KEY", "unit-test-secret")
+    monkeypatch.setattr(settings, "ALGORITHM", "HS256")
+    token = security.create_access_token({"user_id": "u1"})
+    payload = jwt.decode(token, "unit-test-secret", algorithms=["HS256"])
+    assert payload["user_id"] == "u1"
+    assert isinstance(payload["exp"], int)
+
+
+def test_prepared_key_rejects_token_signed_with_other_secret(monkeypatch):
+    monkeypatch.setattr(settings, "SECRET_KEY", "unit-test-secret")
+    monkeypatch.setattr(settings, "ALGORITHM", "HS256")
+    security._verified_token_cache.clear()
+    assert security.verify_token(security.create_access_token({"user_id": "u1"}))["user_id"] == "u1"
+    forged = jwt.encode({"user_id": "u1", "exp": 4_000_000_000}, "other-secret", algorithm="HS256")
+    assert security.verify_token(forged) is None
+
+
+def test_dummy_password_check_reuses_one_hash():
+    security._dummy_password_hash.cache_clear()
+    security.verify_dummy_password("whatever")
+    first = security._dummy_password_hash()
+    security.verify_dummy_password("something else")
+    assert security._dummy_password_hash() is first
+    assert not verify_password("whatever", first)
+
+
+def test_refresh_token_hash_is_sha256_hex():
+    value = security.create_refresh_token_value()
+    digest = security.hash_refresh_token(value)
+    assert len(digest) == 64
+    assert set(digest) <= set(string.hexdigits.lower())
+    assert digest == security.hash_refresh_token(value)
+    assert digest != security.hash_refresh_token(value + "x")
+
+
+def test_verified_token_is_decoded_once(monkeypatch):
+    security._verified_token_cache.clear()
+    token = security.create_access_token({"user_id": str(uuid.uuid4())})
+    calls = []
+    real_decode = security.jwt.decode
+    monkeypatch.setattr(
+        security.jwt, "decode", lambda *a, **kw: calls.append(1) or real_decode(*a, **kw)
+    )
+
+    first = security.verify_token(token)
+    first["user_id"] = "mutated"
+    second = security.verify_token(token)
+    assert security.get_token_info(token)["user_id"] == second["user_id"]
+    assert len(calls) == 1
+    assert second["user_id"] != "mutated"
+
+
+def test_cached_token_is_reverified_after_exp(monkeypatch):
+    security._verified_token_cache.clear()
+    token = security.create_access_token({"user_id": "u"})
+    assert security.verify_token(token) is not None
+    key = next(iter(security._verified_token_cache))
+    payload, _ = security._verified_token_cache[key]
+    security._verified_token_cache[key] = (payload, 0.0)
+
+    calls = []
+    real_decode = security.jwt.decode
+    monkeypatch.setattr(
+        security.jwt, "decode", lambda *a, **kw: calls.append(1) or real_decode(*a, **kw)
+    )
+    assert security.verify_token(token) is not None
+    assert len(calls) == 1
+
+
+def test_invalid_token_is_not_cached():
+    security._verified_token_cache.clear()
+    assert security.verify_token("not-a-jwt") is None
+    assert len(security._verified_token_cache) == 0
+
+
+def test_refresh_token_value_carries_256_bits():
+    value = security.create_refresh_token_value()
+    assert len(value) == 43
+    assert value != security.create_refresh_token_value()
+
+
+def test_token_cache_does_not_hold_raw_token():
+    security._verified_token_cache.clear()
+    token = security.create_access_token({"user_id": "u"})
+    assert security.verify_token(token) is not None
+    key = next(iter(security._verified_token_cache))
+    assert token not in key
+
+
+def test_password_reset_token_hash_is_sha256_hex():
+    token, _ = security.create_password_reset_token(uuid.uuid4())
+    digest = security.hash_password_reset_token(token)
+    assert len(digest) == 64
+    assert digest == security.hash_password_reset_token(token)
+    assert digest != token
+
+
+def test_payload_expired_checks_exp_without_decoding():
+    assert security.payload_expired(None)
+    assert security.payload_expired({"user_id": "u"})
+    assert security.payload_expired({"exp": time.time() - 1})
+    assert not security.payload_expired({"exp": time.time() + 60})
+
+
+def test_access_token_exp_is_integer_and_claims_untouched():
+    claims = {"user_id": "u1"}
+    token = security.create_access_token(claims, timedelta(minutes=5))
+    assert claims == {"user_id": "u1"}
+    exp = jwt.get_unverified_claims(token)["exp"]
+    assert isinstance(exp, int)
+    assert 0 < exp - time.time() <= 300
+
+
+def test_unknown_hash_scheme_rejected_at_startup():
+    with pytest.raises(ValidationError):
+        AuthSettings(password_hash_scheme="Argon2id")
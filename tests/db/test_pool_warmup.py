@@ -0,0 +1,26 @@
+"""app.db.session.warm_pool — startup pre-connection of the sync pool."""
+from __future__ import annotations
+
+from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool
+
+from app.core.config import settings
+from app.db import session as db_session
+
+
+def test_warm_pool_opens_connections_and_returns_them(monkeypatch, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'warm.db'}", poolclass=QueuePool, pool_size=5)
+    monkeypatch.setattr(db_session, "engine", engine)
+    monkeypatch.setattr(settings, "DATABASE_POOL_SIZE", 5)
+
+    assert db_session.warm_pool(3) == 3
+    assert engine.pool.checkedin() == 3
+    assert engine.pool.checkedout() == 0
+
+
+def test_warm_pool_is_capped_at_pool_size(monkeypatch, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'warm.db'}", poolclass=QueuePool, pool_size=2)
+    monkeypatch.setattr(db_session, "engine", engine)
+    monkeypatch.setattr(settings, "DATABASE_POOL_SIZE", 2)
+
+    assert db_session.warm_pool(10) == 2
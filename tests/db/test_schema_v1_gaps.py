@@ -14,6 +14,7 @@ from app.models.user import User
 from app.models.api_key import Apikey
 from app.models.invite import Invite
 from app.models.refresh_token import RefreshToken
+from app.models.password_reset import PasswordResetToken
 
 
 def _column(model, name: str) -> sa.Column:
@@ -109,6 +110,21 @@ class TestIndexes:
         names = self._index_names(User)
         assert "uq_user_email_active" in names
 
+    @pytest.mark.parametrize("model", [RefreshToken, PasswordResetToken])
+    def test_token_lookup_index_is_unique(self, model):
+        # /refresh, /logout and /reset-password look tokens up by value
+        idx = next(i for i in model.__table__.indexes if i.name == f"ix_{model.__tablename__}_token")
+        assert idx.unique
+        assert [c.name for c in idx.columns] == ["token"]
+
+    def test_unused_reset_token_index_is_partial(self):
+        idx = next(
+            i for i in PasswordResetToken.__table__.indexes
+            if i.name == "ix_passwordresettoken_unused_user_id"
+        )
+        assert [c.name for c in idx.columns] == ["user_id"]
+        assert "used = false" in str(idx.dialect_options["postgresql"]["where"])
+
 
 # ------------------------------------------------------------------- created_at
 
@@ -75,6 +75,14 @@ class TestAgentV2Indexes:
         names = _index_names(Agent)
         assert "ix_agent_tenant_id" in names
 
+    def test_agent_listing_index_matches_list_query(self):
+        idx = next(
+            i for i in Agent.__table__.indexes
+            if i.name == "ix_agent_active_tenant_id_created_at"
+        )
+        assert [c.name for c in idx.columns] == ["tenant_id", "created_at"]
+        assert "is_deleted = false" in str(idx.dialect_options["postgresql"]["where"])
+
 
 # ────────────────────────────────────────── callflow model ───────────────────
 
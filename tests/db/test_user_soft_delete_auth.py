@@ -30,6 +30,7 @@ from app.core.security import create_user_token
 from app.core.security import (
     get_password_hash,
     create_refresh_token_value,
+    hash_refresh_token,
     refresh_token_expires_at,
 )
 from app.main import app
@@ -211,9 +212,10 @@ class TestSoftDeleteLogin:
 class TestSoftDeleteRefresh:
     def test_deleted_user_refresh_rejected(self, db, deleted_user):
         """Refresh endpoint must reject tokens tied to soft-deleted users."""
+        rt_value = create_refresh_token_value()
         rt = RefreshToken(
             user_id=deleted_user.id,
-            token=create_refresh_token_value(),
+            token=hash_refresh_token(rt_value),
             expires_at=refresh_token_expires_at(),
         )
         db.add(rt)
@@ -222,7 +224,7 @@ class TestSoftDeleteRefresh:
         with TestClient(app) as client:
             resp = client.post(
                 "/api/v1/users/refresh",
-                json={"refresh_token": rt.token},
+                json={"refresh_token": rt_value},
             )
 
         assert resp.status_code == 401
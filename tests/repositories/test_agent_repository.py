@@ -81,3 +81,67 @@ def test_find_by_workspace_paginates(db, tenant: Tenant):
     rows, total = repo.find_by_workspace(tenant.id, page=1, limit=2)
     assert total == 3
     assert len(rows) == 2
+
+
+@pytest.mark.usefixtures("db")
+def test_search_by_name_matches_active_agents_in_workspace(db, tenant: Tenant):
+    repo = AgentRepository(db)
+    base = {
+        "tenant_id": tenant.id,
+        "status": "active",
+        "llm_model": "gpt-4o-mini",
+        "tts_provider_slug": "11labs",
+        "tts_voice_external_id": "v",
+        "tts_language": "en",
+    }
+    repo.create({**base, "name": "Sales Bot"})
+    repo.soft_delete(repo.create({**base, "name": "Old Sales Bot"}))
+    repo.create({**base, "name": "Support"})
+
+    rows = repo.search_by_name(tenant.id, "  SALES ")
+    assert [a.name for a in rows] == ["Sales Bot"]
+
+
+@pytest.mark.usefixtures("db")
+def test_create_and_update_return_flushed_agent_without_reload(db, tenant: Tenant, captured_sql):
+    repo = AgentRepository(db)
+    with captured_sql(lambda statement: statement.lstrip().upper().startswith("SELECT")) as statements:
+        agent = repo.create(
+            {
+                "tenant_id": tenant.id,
+                "name": "Fresh",
+                "llm_model": "gpt-4o-mini",
+                "tts_provider_slug": "11labs",
+                "tts_voice_external_id": "v",
+                "tts_language": "en",
+            }
+        )
+        assert agent.created_at is not None
+        assert agent.status == "pending"
+
+        repo.update(agent, {"name": "Renamed"})
+        assert agent.updated_at is not None
+    assert statements == []
+
+    db.commit()
+    db.expire_all()
+    assert agent.name == "Renamed"
+
+
+@pytest.mark.usefixtures("db")
+def test_find_by_id_uses_identity_map(db, tenant: Tenant, captured_sql):
+    repo = AgentRepository(db)
+    agent = repo.create(
+        {
+            "tenant_id": tenant.id,
+            "name": "Mapped",
+            "llm_model": "gpt-4o-mini",
+            "tts_provider_slug": "11labs",
+            "tts_voice_external_id": "v",
+            "tts_language": "en",
+        }
+    )
+
+    with captured_sql() as statements:
+        assert repo.find_by_id(agent.id) is agent
+    assert statements == []
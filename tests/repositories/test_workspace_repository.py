@@ -0,0 +1,24 @@
+"""WorkspaceRepository schema-name allocation against in-memory SQLite."""
+from __future__ import annotations
+
+import uuid
+
+from app.repositories import workspace_repository
+from app.repositories.workspace_repository import WorkspaceRepository
+
+
+def test_insert_suffixes_a_taken_schema_name(db):
+    repo = WorkspaceRepository(db)
+    base = f"Repo {uuid.uuid4().hex[:6]}"
+
+    first = repo.insert(base, status="active", credits=0)
+    second = repo.insert(f"{base}!", status="pending_payment", credits=50)
+    third = repo.insert(f"{base}?", status="active", credits=0)
+    db.commit()
+
+    assert first.schema_name == workspace_repository.generate_schema_name(base)
+    slug = first.schema_name.removesuffix("_schema")
+    assert second.schema_name == f"{slug}_1_schema"
+    assert third.schema_name == f"{slug}_2_schema"
+    assert (second.status, second.credits) == ("pending_payment", 50)
+
@@ -1,7 +1,7 @@
 """Unit tests for the Redis-backed RBAC role cache.
 
-No real Redis is required in CI — a tiny in-memory fake stands in for the
-sync redis client (mirrors the dict-and-TTL surface area we actually use:
+No real Redis is required in CI — conftest's in-memory fake stands in for
+the sync redis client (mirrors the dict-and-TTL surface area we actually use:
 get/set/delete). Falling open to a direct DB read when Redis is truly
 unavailable is covered separately (get_redis_sync() returns None there).
 """
@@ -18,31 +18,6 @@ from app.models.tenant import Tenant
 from app.models.user import User, user_tenant_association
 
 
-class _FakeRedis:
-    """Minimal get/set/delete fake — no TTL expiry simulation needed for these tests."""
-
-    def __init__(self):
-        self.store: dict[str, str] = {}
-        self.calls: list[str] = []
-
-    def get(self, key: str):
-        self.calls.append(f"get:{key}")
-        return self.store.get(key)
-
-    def set(self, key: str, value: str, ex: int | None = None):
-        self.calls.append(f"set:{key}")
-        self.store[key] = value
-
-    def delete(self, key: str):
-        self.calls.append(f"delete:{key}")
-        self.store.pop(key, None)
-
-
-@pytest.fixture
-def fake_redis():
-    return _FakeRedis()
-
-
 @pytest.fixture
 def tenant(db) -> Tenant:
     t = Tenant(
@@ -0,0 +1,64 @@
+"""Unit tests for the Redis-backed role catalogue cache.
+
+Uses conftest's in-memory fake of the sync redis client, like
+test_rbac_cache_service.
+"""
+from __future__ import annotations
+
+import uuid
+from unittest.mock import patch
+
+import pytest
+
+from app.models.role import Role
+from app.services import role_cache_service, role_service
+
+
+@pytest.fixture(autouse=True)
+def _patched_redis(fake_redis):
+    with patch.object(role_cache_service, "get_redis_sync", return_value=fake_redis):
+        yield
+
+
+def test_list_roles_served_from_cache_after_first_read(db, fake_redis):
+    first = role_cache_service.list_roles(db, 0, 100)
+    assert {r["name"] for r in first} >= {"admin", "read_only"}
+
+    with patch.object(db, "query", side_effect=AssertionError("DB hit on cache hit")):
+        assert role_cache_service.list_roles(db, 0, 100) == first
+
+
+def test_invalidate_forces_fresh_read(db, fake_redis):
+    role_cache_service.list_roles(db, 0, 100)
+
+    extra = Role(name=f"cache-{uuid.uuid4().hex[:6]}", description="temp")
+    db.add(extra)
+    db.commit()
+    try:
+        assert extra.name not in {r["name"] for r in role_cache_service.list_roles(db, 0, 100)}
+        role_cache_service.invalidate()
+        assert extra.name in {r["name"] for r in role_cache_service.list_roles(db, 0, 100)}
+    finally:
+        db.delete(extra)
+        db.commit()
+
+
+def test_get_role_missing_is_not_cached(db, fake_redis):
+    assert role_cache_service.get_role(db, uuid.uuid4()) is None
+    assert not any(":id:" in k for k in fake_redis.store)
+
+
+def test_falls_open_without_redis(db):
+    with patch.object(role_cache_service, "get_redis_sync", return_value=None):
+        admin = db.query(Role).filter(Role.name == "admin").first()
+        assert role_cache_service.get_role(db, admin.id)["name"] == "admin"
+
+
+def test_invalidate_also_clears_role_id_cache(db, fake_redis):
+    role_service.get_role_id_by_name(db, role_service.READ_ONLY)
+    assert role_service._role_id_cache
+
+    role_cache_service.invalidate()
+
+    assert role_service._role_id_cache == {}
+    assert fake_redis.store["roles:gen"] == "1"
@@ -0,0 +1,96 @@
+"""Unit tests for the role-id cache and membership role lookups in role_service."""
+from __future__ import annotations
+
+import uuid
+
+import pytest
+
+from app.models.role import Role
+from app.models.tenant import Tenant
+from app.models.user import User, user_tenant_association
+from app.services import role_service
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    role_service.clear_role_cache()
+    yield
+    role_service.clear_role_cache()
+
+
+def _is_role_query(statement: str) -> bool:
+    return "FROM role" in statement
+
+
+def test_get_role_id_by_name_hits_db_once(db, captured_sql):
+    expected = db.query(Role).filter(Role.name == role_service.READ_ONLY).first().id
+    with captured_sql(_is_role_query) as statements:
+        assert role_service.get_role_id_by_name(db, role_service.READ_ONLY) == expected
+        assert role_service.get_role_id_by_name(db, role_service.READ_ONLY) == expected
+    assert len(statements) == 1
+
+
+def test_unknown_role_is_not_cached(db):
+    assert role_service.get_role_id_by_name(db, "no_such_role") is None
+    assert "no_such_role" not in role_service._role_id_cache
+
+
+def test_clear_role_cache_forces_reload(db):
+    role_service.get_role_id_by_name(db, role_service.READ_ONLY)
+    role_service.clear_role_cache()
+    assert role_service._role_id_cache == {}
+
+
+def test_expired_entry_is_reloaded(db, monkeypatch, captured_sql):
+    role_service.get_role_id_by_name(db, role_service.READ_ONLY)
+    role_id, _ = role_service._role_id_cache[role_service.READ_ONLY]
+    role_service._role_id_cache[role_service.READ_ONLY] = (role_id, 0.0)
+
+    with captured_sql(_is_role_query) as statements:
+        assert role_service.get_role_id_by_name(db, role_service.READ_ONLY) == role_id
+    assert len(statements) == 1
+
+
+@pytest.fixture
+def member_with_role(db):
+    role = Role(name=f"temp-{uuid.uuid4().hex[:6]}", description="temp")
+    tenant = Tenant(name="RBAC Tenant", schema_name=f"s_{uuid.uuid4().hex[:6]}")
+    user = User(
+        email=f"rbac-{uuid.uuid4().hex[:6]}@example.com",
+        first_name="Rbac",
+        last_name="User",
+        hashed_password="",
+    )
+    db.add_all([role, tenant, user])
+    db.commit()
+    db.execute(
+        user_tenant_association.insert().values(
+            user_id=user.id, tenant_id=tenant.id, role_id=role.id
+        )
+    )
+    db.commit()
+    return user, tenant, role
+
+
+def test_membership_role_details_read_role_in_one_query(db, member_with_role, captured_sql):
+    user, tenant, role = member_with_role
+    with captured_sql(lambda sql: "user_tenant_association" in sql) as statements:
+        details = role_service.get_membership_role_details(db, user.id, tenant.id)
+    assert len(statements) == 1
+    found, display = details
+    assert (found.id, found.name, found.description) == (role.id, role.name, role.description)
+    assert display == {"name": role.name, "description": role.description}
+
+
+def test_membership_roles_follow_a_rename_without_cache_clear(db, member_with_role):
+    user, tenant, role = member_with_role
+    role_service.get_role_id_by_name(db, role.name)
+
+    # Renamed on "another worker": the local cache was never cleared.
+    role.name = f"renamed-{uuid.uuid4().hex[:6]}"
+    db.commit()
+
+    assert role_service.get_membership_role_name(db, user.id, tenant.id) == role.name
+    assert role_service.get_membership_role_details(db, user.id, tenant.id)[0].name == role.name
+    (membership,) = role_service.get_user_memberships(db, user.id)
+    assert role_service.resolve_membership_role(membership)[0].name == role.name
@@ -0,0 +1,166 @@
+"""Unit tests for the process-local authenticated-user cache.
+
+Uses conftest's in-memory fake of the sync redis client for the per-user
+version keys, like test_role_cache_service.
+"""
+from __future__ import annotations
+
+import uuid
+from unittest.mock import patch
+
+import pytest
+
+from app.api.deps.db import get_active_user_by_id
+from app.models.user import User
+from app.services import user_cache_service
+
+
+@pytest.fixture(autouse=True)
+def _patched_redis(fake_redis):
+    user_cache_service.clear()
+    with patch.object(user_cache_service, "get_redis_sync", return_value=fake_redis):
+        yield
+    user_cache_service.clear()
+
+
+@pytest.fixture
+def user(db) -> User:
+    u = User(
+        email=f"cached-{uuid.uuid4().hex[:6]}@example.com",
+        first_name="Cached",
+        last_name="User",
+        hashed_password="",
+    )
+    db.add(u)
+    db.commit()
+    db.refresh(u)
+    return u
+
+
+def _is_user_select(statement: str) -> bool:
+    return statement.lstrip().upper().startswith("SELECT") and 'FROM "user"' in statement
+
+
+def test_cached_lookup_skips_select_on_second_call(db, user, captured_sql):
+    assert get_active_user_by_id(db, user.id, cached=True).id == user.id
+    db.expunge_all()
+
+    with captured_sql(_is_user_select) as statements:
+        again = get_active_user_by_id(db, user.id, cached=True)
+    assert again.email == user.email
+    assert statements == []
+
+
+def test_cached_user_is_session_bound_and_writable(db, user):
+    get_active_user_by_id(db, user.id, cached=True)
+    db.expunge_all()
+
+    merged = get_active_user_by_id(db, user.id, cached=True)
+    merged.first_name = "Renamed"
+    db.commit()
+
+    assert user.id not in user_cache_service._user_cache
+    db.expunge_all()
+    assert get_active_user_by_id(db, user.id).first_name == "Renamed"
+
+
+def test_uncached_lookup_does_not_populate_cache(db, user):
+    get_active_user_by_id(db, user.id)
+    assert user.id not in user_cache_service._user_cache
+
+
+def test_invalidate_forces_reload(db, user):
+    get_active_user_by_id(db, user.id, cached=True)
+    user_cache_service.invalidate(user.id)
+    assert user_cache_service.get(db, user.id, user_cache_service.generation(user.id)) is None
+
+
+def test_full_cache_evicts_oldest_entry_only(db, user, monkeypatch):
+    monkeypatch.setattr(user_cache_service, "MAX_ENTRIES", 2)
+    older, newer = uuid.uuid4(), uuid.uuid4()
+    user_cache_service._user_cache[older] = ({}, float("inf"), "0")
+    user_cache_service._user_cache[newer] = ({}, float("inf"), "0")
+
+    user_cache_service.store(user, "0")
+
+    assert older not in user_cache_service._user_cache
+    assert newer in user_cache_service._user_cache
+    assert user.id in user_cache_service._user_cache
+
+
+def test_cache_hit_keeps_changes_made_earlier_in_the_request(db, user):
+    get_active_user_by_id(db, user.id, cached=True)
+    db.expunge_all()
+
+    loaded = get_active_user_by_id(db, user.id, cached=True)
+    loaded.current_tenant_id = None
+    loaded.first_name = "Unsaved"
+
+    again = get_active_user_by_id(db, user.id, cached=True)
+    assert again is loaded
+    assert again.first_name == "Unsaved"
+
+
+def test_write_evicts_on_commit_not_flush(db, user):
+    get_active_user_by_id(db, user.id, cached=True)
+    user.first_name = "Flushed"
+    db.flush()
+    # A lookup racing this transaction would still see (and re-cache) the old
+    # row, so the entry may only go once the write is committed.
+    assert user.id in user_cache_service._user_cache
+
+    db.commit()
+    assert user.id not in user_cache_service._user_cache
+
+
+def test_write_in_another_worker_makes_entry_stale(db, user, fake_redis, captured_sql):
+    get_active_user_by_id(db, user.id, cached=True)
+    db.expunge_all()
+    # Another worker soft-deleted or deactivated the user: only the shared
+    # version key changes, this worker's entry is still in memory.
+    fake_redis.set(f"users:gen:{user.id}", "bumped-elsewhere")
+    assert user.id in user_cache_service._user_cache
+
+    with captured_sql(_is_user_select) as statements:
+        get_active_user_by_id(db, user.id, cached=True)
+    assert len(statements) == 1
+
+
+def test_cache_bypassed_without_redis(db, user):
+    with patch.object(user_cache_service, "get_redis_sync", return_value=None):
+        get_active_user_by_id(db, user.id, cached=True)
+    assert user.id not in user_cache_service._user_cache
+
+
+def test_mutable_values_are_not_shared_between_lookups(db, user):
+    user.provider_profile = {"name": "original"}
+    db.commit()
+    get_active_user_by_id(db, user.id, cached=True)
+    db.expunge_all()
+
+    first = get_active_user_by_id(db, user.id, cached=True)
+    first.provider_profile["name"] = "mutated in place"
+    db.expunge_all()
+
+    second = get_active_user_by_id(db, user.id, cached=True)
+    assert second.provider_profile == {"name": "original"}
+
+
+def test_write_to_one_user_keeps_other_users_cached(db, user):
+    other = User(
+        email=f"cached-{uuid.uuid4().hex[:6]}@example.com",
+        first_name="Other",
+        last_name="User",
+        hashed_password="",
+    )
+    db.add(other)
+    db.commit()
+    get_active_user_by_id(db, user.id, cached=True)
+    get_active_user_by_id(db, other.id, cached=True)
+
+    user.first_name = "Changed"
+    db.commit()
+
+    assert user.id not in user_cache_service._user_cache
+    db.expunge_all()
+    assert user_cache_service.get(db, other.id, user_cache_service.generation(other.id)) is not None